@@ -24,6 +24,7 @@ from app.models.schemas import (
 from app.services.chatbot_service import ChatbotService
 from app.services.llm_service import LLMService
 from app.services.vector_store import VectorStoreService
+from app.utils.responses import format_sse_event
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -942,8 +943,7 @@ async def chat_with_invoices_streaming(
                     timestamp=datetime.now(timezone.utc),
                 )
 
-                chunk_json = streaming_chunk.model_dump_json()
-                yield f"data: {chunk_json}\n\n"
+                yield format_sse_event(streaming_chunk)
 
                 await asyncio.sleep(0.1)
 
@@ -976,7 +976,7 @@ async def chat_with_invoices_streaming(
                 data=f"Error processing chat query: {str(e)}",
                 timestamp=datetime.now(timezone.utc),
             )
-            yield f"data: {error_chunk.model_dump_json()}\n\n"
+            yield format_sse_event(error_chunk)
 
     return StreamingResponse(
         generate_streaming_response(),
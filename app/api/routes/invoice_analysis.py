@@ -10,11 +10,13 @@ import logging
 import os
 import tempfile
 from datetime import datetime, timezone
+from typing import Dict, Optional
 
 import aiofiles
 from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile
 from fastapi.responses import StreamingResponse
 
+from app.core.config import settings
 from app.models.schemas import (
     InvoiceAnalysisProgress,
     InvoiceAnalysisResponse,
@@ -25,13 +27,14 @@ from app.services.llm_service import LLMService
 from app.services.pdf_processor import PDFProcessor
 from app.services.vector_store import VectorStoreService
 from app.utils.file_utils import (
-    extract_zip_file,
+    extract_zip_file_with_hashes,
     generate_file_hash_from_path,
     generate_upload_file_hash,
     sanitize_filename,
     save_uploaded_file,
     validate_file,
 )
+from app.utils.responses import format_sse_event
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -386,7 +389,8 @@ async def analyze_invoices(
                     logger.warning(f"Failed to store policy in vector database: {e}")
 
             zip_path = await save_uploaded_file(invoices_zip, temp_dir)
-            invoice_files = await extract_zip_file(zip_path, temp_dir)
+            extracted_invoices = await extract_zip_file_with_hashes(zip_path, temp_dir)
+            invoice_files = [invoice_path for invoice_path, _ in extracted_invoices]
 
             if not invoice_files:
                 raise HTTPException(
@@ -398,7 +402,7 @@ async def analyze_invoices(
 
             semaphore = asyncio.Semaphore(5)
 
-            async def process_single_invoice(invoice_path: str):
+            async def process_single_invoice(invoice_path: str, invoice_hash: str):
                 async with semaphore:
                     try:
                         return await _process_invoice(
@@ -408,6 +412,7 @@ async def analyze_invoices(
                             pdf_processor,
                             llm_service,
                             vector_store,
+                            invoice_hash=invoice_hash,
                         )
                     except Exception as e:
                         logger.error(f"Error processing invoice {invoice_path}: {e}")
@@ -417,7 +422,8 @@ async def analyze_invoices(
                         return None
 
             tasks = [
-                process_single_invoice(invoice_path) for invoice_path in invoice_files
+                process_single_invoice(invoice_path, invoice_hash)
+                for invoice_path, invoice_hash in extracted_invoices
             ]
             results = await asyncio.gather(*tasks, return_exceptions=True)
 
@@ -461,6 +467,7 @@ async def _process_invoice(
     pdf_processor: PDFProcessor,
     llm_service: LLMService,
     vector_store: VectorStoreService,
+    invoice_hash: Optional[str] = None,
 ) -> dict:
     """
     Process a single invoice file.
@@ -472,11 +479,13 @@ async def _process_invoice(
         pdf_processor: PDF processor service
         llm_service: LLM service
         vector_store: Vector store service
+        invoice_hash: SHA-256 of the file if already known; hashed from disk if not
 
     Returns:
         Dictionary containing analysis results
     """
-    invoice_hash = await generate_file_hash_from_path(invoice_path)
+    if invoice_hash is None:
+        invoice_hash = await generate_file_hash_from_path(invoice_path)
 
     existing_invoice = await vector_store.check_invoice_exists(
         invoice_hash, employee_name
@@ -486,7 +495,6 @@ async def _process_invoice(
         logger.info(
             f"Invoice {os.path.basename(invoice_path)} already processed for {employee_name}"
         )
-        analysis_result = existing_invoice.metadata.get("analysis", {})
         return {
             "filename": os.path.basename(invoice_path),
             "status": existing_invoice.metadata.get("status"),
@@ -501,7 +509,9 @@ async def _process_invoice(
             "from_cache": True,
         }
 
-    invoice_text = await pdf_processor.extract_text(invoice_path)
+    invoice_text = await pdf_processor.extract_text(
+        invoice_path, max_pages=settings.INVOICE_MAX_PAGES
+    )
 
     if not invoice_text.strip():
         raise ValueError("Could not extract text from invoice PDF")
@@ -662,13 +672,23 @@ async def analyze_invoices_streaming(
     async def generate_streaming_analysis():
         """Generate streaming analysis response chunks."""
         try:
-            yield f"data: {InvoiceAnalysisStreamingChunk(type=InvoiceAnalysisStreamingChunkType.METADATA, data={'employee': employee_name, 'status': 'starting'}).model_dump_json()}\n\n"
+            yield format_sse_event(
+                InvoiceAnalysisStreamingChunk(
+                    type=InvoiceAnalysisStreamingChunkType.METADATA,
+                    data={"employee": employee_name, "status": "starting"},
+                )
+            )
 
             pdf_processor = PDFProcessor()
             llm_service = LLMService()
 
             with tempfile.TemporaryDirectory() as temp_dir:
-                yield f"data: {InvoiceAnalysisStreamingChunk(type=InvoiceAnalysisStreamingChunkType.POLICY_PROCESSING, data={'status': 'checking_policy_duplicates'}).model_dump_json()}\n\n"
+                yield format_sse_event(
+                    InvoiceAnalysisStreamingChunk(
+                        type=InvoiceAnalysisStreamingChunkType.POLICY_PROCESSING,
+                        data={"status": "checking_policy_duplicates"},
+                    )
+                )
 
                 from app.utils.file_utils import generate_file_hash
 
@@ -677,10 +697,23 @@ async def analyze_invoices_streaming(
                 existing_policy = await vector_store.check_policy_exists(policy_hash)
 
                 if existing_policy:
-                    yield f"data: {InvoiceAnalysisStreamingChunk(type=InvoiceAnalysisStreamingChunkType.POLICY_PROCESSING, data={'status': 'policy_duplicate_found', 'message': 'Policy already exists, using cached version'}).model_dump_json()}\n\n"
+                    yield format_sse_event(
+                        InvoiceAnalysisStreamingChunk(
+                            type=InvoiceAnalysisStreamingChunkType.POLICY_PROCESSING,
+                            data={
+                                "status": "policy_duplicate_found",
+                                "message": "Policy already exists, using cached version",
+                            },
+                        )
+                    )
                     policy_text = existing_policy.content
                 else:
-                    yield f"data: {InvoiceAnalysisStreamingChunk(type=InvoiceAnalysisStreamingChunkType.POLICY_PROCESSING, data={'status': 'extracting_policy'}).model_dump_json()}\n\n"
+                    yield format_sse_event(
+                        InvoiceAnalysisStreamingChunk(
+                            type=InvoiceAnalysisStreamingChunkType.POLICY_PROCESSING,
+                            data={"status": "extracting_policy"},
+                        )
+                    )
 
                     policy_path = os.path.join(
                         temp_dir, sanitize_filename(policy_filename or "policy.pdf")
@@ -697,7 +730,7 @@ async def analyze_invoices_streaming(
                             type=InvoiceAnalysisStreamingChunkType.ERROR,
                             data={"error": "Could not extract text from policy PDF"},
                         )
-                        yield f"data: {error_chunk.model_dump_json()}\n\n"
+                        yield format_sse_event(error_chunk)
                         return
 
                     try:
@@ -715,7 +748,12 @@ async def analyze_invoices_streaming(
                             f"Failed to store policy in vector database: {e}"
                         )
 
-                yield f"data: {InvoiceAnalysisStreamingChunk(type=InvoiceAnalysisStreamingChunkType.POLICY_PROCESSING, data={'status': 'completed', 'policy_length': len(policy_text)}).model_dump_json()}\n\n"
+                yield format_sse_event(
+                    InvoiceAnalysisStreamingChunk(
+                        type=InvoiceAnalysisStreamingChunkType.POLICY_PROCESSING,
+                        data={"status": "completed", "policy_length": len(policy_text)},
+                    )
+                )
 
                 zip_path = os.path.join(
                     temp_dir, sanitize_filename(zip_filename or "invoices.zip")
@@ -725,14 +763,17 @@ async def analyze_invoices_streaming(
                     await f.write(zip_content)
 
                 logger.info(f"ZIP file saved: {zip_path}")
-                invoice_files = await extract_zip_file(zip_path, temp_dir)
+                extracted_invoices = await extract_zip_file_with_hashes(
+                    zip_path, temp_dir
+                )
+                invoice_files = [invoice_path for invoice_path, _ in extracted_invoices]
 
                 if not invoice_files:
                     error_chunk = InvoiceAnalysisStreamingChunk(
                         type=InvoiceAnalysisStreamingChunkType.ERROR,
                         data={"error": "No PDF files found in the ZIP archive"},
                     )
-                    yield f"data: {error_chunk.model_dump_json()}\n\n"
+                    yield format_sse_event(error_chunk)
                     return
 
                 total_invoices = len(invoice_files)
@@ -747,25 +788,86 @@ async def analyze_invoices_streaming(
                     current_filename=None,
                     stage="starting",
                 )
-                yield f"data: {InvoiceAnalysisStreamingChunk(type=InvoiceAnalysisStreamingChunkType.PROGRESS, data=progress.model_dump()).model_dump_json()}\n\n"
+                yield format_sse_event(
+                    InvoiceAnalysisStreamingChunk(
+                        type=InvoiceAnalysisStreamingChunkType.PROGRESS,
+                        data=progress.model_dump(),
+                    )
+                )
+
+                invoice_hashes = [
+                    invoice_hash for _, invoice_hash in extracted_invoices
+                ]
+                existing_invoices = await vector_store.check_files_exist(
+                    [
+                        (invoice_hash, "invoice_analysis")
+                        for invoice_hash in invoice_hashes
+                    ],
+                    employee_name=employee_name,
+                )
+                # Results already produced in this request by file hash, so a
+                # PDF repeated inside the ZIP is analyzed only once.
+                seen_results: Dict[str, dict] = {}
 
-                for idx, invoice_path in enumerate(invoice_files, 1):
+                for idx, (invoice_path, invoice_hash) in enumerate(
+                    zip(invoice_files, invoice_hashes), 1
+                ):
                     filename = os.path.basename(invoice_path)
 
                     try:
                         progress.current_invoice = idx
                         progress.current_filename = filename
                         progress.stage = "checking_duplicates"
-                        yield f"data: {InvoiceAnalysisStreamingChunk(type=InvoiceAnalysisStreamingChunkType.PROGRESS, data=progress.model_dump()).model_dump_json()}\n\n"
+                        yield format_sse_event(
+                            InvoiceAnalysisStreamingChunk(
+                                type=InvoiceAnalysisStreamingChunkType.PROGRESS,
+                                data=progress.model_dump(),
+                            )
+                        )
 
-                        invoice_hash = await generate_file_hash_from_path(invoice_path)
+                        seen_result = seen_results.get(invoice_hash)
+                        if seen_result is not None:
+                            yield format_sse_event(
+                                InvoiceAnalysisStreamingChunk(
+                                    type=InvoiceAnalysisStreamingChunkType.INVOICE_ANALYSIS,
+                                    data={
+                                        "filename": filename,
+                                        "status": "duplicate_found",
+                                        "message": "Invoice repeated in this upload, returning its result",
+                                    },
+                                )
+                            )
 
-                        existing_invoice = await vector_store.check_invoice_exists(
-                            invoice_hash, employee_name
-                        )
+                            result_data = {
+                                **seen_result,
+                                "filename": filename,
+                                "from_cache": True,
+                            }
+
+                            analysis_results.append(result_data)
+                            progress.processed_invoices += 1
+
+                            yield format_sse_event(
+                                InvoiceAnalysisStreamingChunk(
+                                    type=InvoiceAnalysisStreamingChunkType.RESULT,
+                                    data=result_data,
+                                )
+                            )
+                            continue
+
+                        existing_invoice = existing_invoices.get(invoice_hash)
 
                         if existing_invoice:
-                            yield f"data: {InvoiceAnalysisStreamingChunk(type=InvoiceAnalysisStreamingChunkType.INVOICE_ANALYSIS, data={'filename': filename, 'status': 'duplicate_found', 'message': 'Invoice already processed, returning cached result'}).model_dump_json()}\n\n"
+                            yield format_sse_event(
+                                InvoiceAnalysisStreamingChunk(
+                                    type=InvoiceAnalysisStreamingChunkType.INVOICE_ANALYSIS,
+                                    data={
+                                        "filename": filename,
+                                        "status": "duplicate_found",
+                                        "message": "Invoice already processed, returning cached result",
+                                    },
+                                )
+                            )
 
                             result_data = {
                                 "filename": filename,
@@ -788,25 +890,57 @@ async def analyze_invoices_streaming(
                             }
 
                             analysis_results.append(result_data)
+                            seen_results[invoice_hash] = result_data
                             progress.processed_invoices += 1
 
-                            yield f"data: {InvoiceAnalysisStreamingChunk(type=InvoiceAnalysisStreamingChunkType.RESULT, data=result_data).model_dump_json()}\n\n"
+                            yield format_sse_event(
+                                InvoiceAnalysisStreamingChunk(
+                                    type=InvoiceAnalysisStreamingChunkType.RESULT,
+                                    data=result_data,
+                                )
+                            )
                             continue
 
                         progress.stage = "extracting_text"
-                        yield f"data: {InvoiceAnalysisStreamingChunk(type=InvoiceAnalysisStreamingChunkType.PROGRESS, data=progress.model_dump()).model_dump_json()}\n\n"
+                        yield format_sse_event(
+                            InvoiceAnalysisStreamingChunk(
+                                type=InvoiceAnalysisStreamingChunkType.PROGRESS,
+                                data=progress.model_dump(),
+                            )
+                        )
 
-                        yield f"data: {InvoiceAnalysisStreamingChunk(type=InvoiceAnalysisStreamingChunkType.INVOICE_EXTRACTION, data={'filename': filename, 'status': 'extracting'}).model_dump_json()}\n\n"
+                        yield format_sse_event(
+                            InvoiceAnalysisStreamingChunk(
+                                type=InvoiceAnalysisStreamingChunkType.INVOICE_EXTRACTION,
+                                data={"filename": filename, "status": "extracting"},
+                            )
+                        )
 
-                        invoice_text = await pdf_processor.extract_text(invoice_path)
+                        invoice_text = await pdf_processor.extract_text(
+                            invoice_path, max_pages=settings.INVOICE_MAX_PAGES
+                        )
 
                         if not invoice_text.strip():
                             raise ValueError("Could not extract text from invoice PDF")
 
-                        yield f"data: {InvoiceAnalysisStreamingChunk(type=InvoiceAnalysisStreamingChunkType.INVOICE_EXTRACTION, data={'filename': filename, 'status': 'completed', 'text_length': len(invoice_text)}).model_dump_json()}\n\n"
+                        yield format_sse_event(
+                            InvoiceAnalysisStreamingChunk(
+                                type=InvoiceAnalysisStreamingChunkType.INVOICE_EXTRACTION,
+                                data={
+                                    "filename": filename,
+                                    "status": "completed",
+                                    "text_length": len(invoice_text),
+                                },
+                            )
+                        )
 
                         progress.stage = "analyzing"
-                        yield f"data: {InvoiceAnalysisStreamingChunk(type=InvoiceAnalysisStreamingChunkType.PROGRESS, data=progress.model_dump()).model_dump_json()}\n\n"
+                        yield format_sse_event(
+                            InvoiceAnalysisStreamingChunk(
+                                type=InvoiceAnalysisStreamingChunkType.PROGRESS,
+                                data=progress.model_dump(),
+                            )
+                        )
 
                         analysis_result = None
                         async for chunk in llm_service.analyze_invoice_streaming(
@@ -814,7 +948,12 @@ async def analyze_invoices_streaming(
                             policy_text=policy_text,
                             employee_name=employee_name,
                         ):
-                            yield f"data: {InvoiceAnalysisStreamingChunk(type=InvoiceAnalysisStreamingChunkType.INVOICE_ANALYSIS, data={**chunk['data'], 'filename': filename}).model_dump_json()}\n\n"
+                            yield format_sse_event(
+                                InvoiceAnalysisStreamingChunk(
+                                    type=InvoiceAnalysisStreamingChunkType.INVOICE_ANALYSIS,
+                                    data={**chunk["data"], "filename": filename},
+                                )
+                            )
 
                             if chunk.get("data", {}).get("status") == "completed":
                                 analysis_result = chunk["data"]["result"]
@@ -823,9 +962,19 @@ async def analyze_invoices_streaming(
                             raise ValueError("Analysis did not complete successfully")
 
                         progress.stage = "storing"
-                        yield f"data: {InvoiceAnalysisStreamingChunk(type=InvoiceAnalysisStreamingChunkType.PROGRESS, data=progress.model_dump()).model_dump_json()}\n\n"
+                        yield format_sse_event(
+                            InvoiceAnalysisStreamingChunk(
+                                type=InvoiceAnalysisStreamingChunkType.PROGRESS,
+                                data=progress.model_dump(),
+                            )
+                        )
 
-                        yield f"data: {InvoiceAnalysisStreamingChunk(type=InvoiceAnalysisStreamingChunkType.VECTOR_STORAGE, data={'filename': filename, 'status': 'storing'}).model_dump_json()}\n\n"
+                        yield format_sse_event(
+                            InvoiceAnalysisStreamingChunk(
+                                type=InvoiceAnalysisStreamingChunkType.VECTOR_STORAGE,
+                                data={"filename": filename, "status": "storing"},
+                            )
+                        )
 
                         await vector_store.store_invoice_analysis(
                             invoice_text=invoice_text,
@@ -835,7 +984,12 @@ async def analyze_invoices_streaming(
                             file_hash=invoice_hash,
                         )
 
-                        yield f"data: {InvoiceAnalysisStreamingChunk(type=InvoiceAnalysisStreamingChunkType.VECTOR_STORAGE, data={'filename': filename, 'status': 'completed'}).model_dump_json()}\n\n"
+                        yield format_sse_event(
+                            InvoiceAnalysisStreamingChunk(
+                                type=InvoiceAnalysisStreamingChunkType.VECTOR_STORAGE,
+                                data={"filename": filename, "status": "completed"},
+                            )
+                        )
 
                         result_data = {
                             "filename": filename,
@@ -854,12 +1008,23 @@ async def analyze_invoices_streaming(
                         }
 
                         analysis_results.append(result_data)
+                        seen_results[invoice_hash] = result_data
 
-                        yield f"data: {InvoiceAnalysisStreamingChunk(type=InvoiceAnalysisStreamingChunkType.RESULT, data=result_data).model_dump_json()}\n\n"
+                        yield format_sse_event(
+                            InvoiceAnalysisStreamingChunk(
+                                type=InvoiceAnalysisStreamingChunkType.RESULT,
+                                data=result_data,
+                            )
+                        )
 
                         progress.processed_invoices += 1
                         progress.stage = "completed"
-                        yield f"data: {InvoiceAnalysisStreamingChunk(type=InvoiceAnalysisStreamingChunkType.PROGRESS, data=progress.model_dump()).model_dump_json()}\n\n"
+                        yield format_sse_event(
+                            InvoiceAnalysisStreamingChunk(
+                                type=InvoiceAnalysisStreamingChunkType.PROGRESS,
+                                data=progress.model_dump(),
+                            )
+                        )
 
                     except Exception as e:
                         logger.error(f"Error processing invoice {filename}: {e}")
@@ -867,8 +1032,18 @@ async def analyze_invoices_streaming(
                         processing_errors.append(error_data)
 
                         progress.failed_invoices += 1
-                        yield f"data: {InvoiceAnalysisStreamingChunk(type=InvoiceAnalysisStreamingChunkType.ERROR, data=error_data).model_dump_json()}\n\n"
-                        yield f"data: {InvoiceAnalysisStreamingChunk(type=InvoiceAnalysisStreamingChunkType.PROGRESS, data=progress.model_dump()).model_dump_json()}\n\n"
+                        yield format_sse_event(
+                            InvoiceAnalysisStreamingChunk(
+                                type=InvoiceAnalysisStreamingChunkType.ERROR,
+                                data=error_data,
+                            )
+                        )
+                        yield format_sse_event(
+                            InvoiceAnalysisStreamingChunk(
+                                type=InvoiceAnalysisStreamingChunkType.PROGRESS,
+                                data=progress.model_dump(),
+                            )
+                        )
 
                 completion_data = {
                     "success": True,
@@ -884,7 +1059,12 @@ async def analyze_invoices_streaming(
                     "timestamp": datetime.now(timezone.utc).isoformat(),
                 }
 
-                yield f"data: {InvoiceAnalysisStreamingChunk(type=InvoiceAnalysisStreamingChunkType.DONE, data=completion_data).model_dump_json()}\n\n"
+                yield format_sse_event(
+                    InvoiceAnalysisStreamingChunk(
+                        type=InvoiceAnalysisStreamingChunkType.DONE,
+                        data=completion_data,
+                    )
+                )
 
                 logger.info(
                     f"Streaming invoice analysis completed for {employee_name}. "
@@ -899,7 +1079,7 @@ async def analyze_invoices_streaming(
                 type=InvoiceAnalysisStreamingChunkType.ERROR,
                 data={"error": f"Internal server error: {str(e)}"},
             )
-            yield f"data: {error_chunk.model_dump_json()}\n\n"
+            yield format_sse_event(error_chunk)
 
     return StreamingResponse(
         generate_streaming_analysis(),
@@ -29,6 +29,14 @@ class LogLevel(str, Enum):
     CRITICAL = "CRITICAL"
 
 
+class EmbeddingBackend(str, Enum):
+    """Inference runtimes for the embedding model."""
+
+    TORCH = "torch"
+    ONNX = "onnx"
+    OPENVINO = "openvino"
+
+
 class Settings(BaseSettings):
     """
     Application settings class with comprehensive validation.
@@ -67,6 +75,10 @@ class Settings(BaseSettings):
     QDRANT_API_KEY: Optional[str] = Field(
         default=None, description="Qdrant API key for cloud instances"
     )
+    QDRANT_PREFER_GRPC: bool = Field(
+        default=True,
+        description="Talk to Qdrant over gRPC (port 6334) instead of REST",
+    )
 
     # Vector Store Configuration
     COLLECTION_NAME: str = Field(
@@ -79,6 +91,23 @@ class Settings(BaseSettings):
         description="Sentence transformer model for embeddings",
     )
     VECTOR_SIZE: int = Field(default=384, gt=0, description="Size of embedding vectors")
+    EMBEDDING_CPU_INT8: bool = Field(
+        default=False,
+        description="Quantize the embedding model to int8 when running on CPU",
+    )
+    EMBEDDING_BACKEND: EmbeddingBackend = Field(
+        default=EmbeddingBackend.TORCH,
+        description="Runtime for the embedding model on CPU: torch, onnx or openvino",
+    )
+    EMBEDDING_NUM_THREADS: Optional[int] = Field(
+        default=None,
+        gt=0,
+        description="CPU threads for embedding inference (default: PyTorch's choice)",
+    )
+    EMBEDDING_ONNX_FILE: Optional[str] = Field(
+        default=None,
+        description="Exported model file for the onnx/openvino backend, e.g. int8",
+    )
 
     # File Upload Configuration
     MAX_FILE_SIZE: int = Field(default=50, gt=0, description="Maximum file size in MB")
@@ -88,6 +117,14 @@ class Settings(BaseSettings):
     UPLOAD_DIRECTORY: str = Field(
         default="uploads", description="Directory for file uploads"
     )
+    INVOICE_MAX_PAGES: int = Field(
+        default=10, gt=0, description="Maximum pages extracted from an invoice PDF"
+    )
+    IO_BUFFER_SIZE: int = Field(
+        default=1024 * 1024,
+        gt=0,
+        description="Bytes per read/write step for saving, extracting and hashing",
+    )
 
     # LLM Configuration
     LLM_MODEL: str = Field(default="gemini-2.5-flash", description="LLM model name")
@@ -97,6 +134,12 @@ class Settings(BaseSettings):
     MAX_TOKENS: int = Field(
         default=4096, gt=0, description="Maximum tokens for LLM responses"
     )
+    STREAM_BATCH_SIZE: int = Field(
+        default=50, gt=0, description="Approximate tokens coalesced per streamed chunk"
+    )
+    STREAM_FLUSH_INTERVAL: float = Field(
+        default=0.2, gt=0.0, description="Maximum seconds a streamed chunk is held back"
+    )
 
     # Chat Configuration
     MAX_CONVERSATION_HISTORY: int = Field(
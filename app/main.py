@@ -57,6 +57,7 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info(f"Shutting down {settings.APP_NAME}")
+    await vector_store.close()
 
 
 
@@ -86,7 +87,7 @@ an intelligent chatbot interface for querying processed invoices.
 - **Backend**: FastAPI with async/await support
 - **AI/ML**: Google Gemini LLM, LangChain, Sentence Transformers
 - **Vector Database**: Qdrant for embeddings storage
-- **Document Processing**: PyPDF2, custom PDF processors
+- **Document Processing**: PyMuPDF, custom PDF processors
 - **Authentication**: Token-based (configurable)
 - **Monitoring**: Comprehensive health checks and logging
 """,
@@ -5,11 +5,17 @@ This service handles interactions with the Gemini LLM for invoice analysis
 and chatbot functionality using structured output schemas.
 """
 
-import json
+import asyncio
+import hashlib
 import logging
+import statistics
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from functools import partial
+from typing import Any, Awaitable, Callable, ClassVar, Dict, List, Optional, Tuple
 
+import orjson
 from google import genai
 from google.genai import types
 
@@ -18,6 +24,90 @@ from app.models.schemas import LLMInvoiceAnalysisResponse, ReimbursementStatus
 
 logger = logging.getLogger(__name__)
 
+_BULLET_CHARS = frozenset(('"', "-", "•"))
+# Leading bullet markers, quotes and the whitespace between them, so that
+# '- "Show me pending claims"' loses both the bullet and the opening quote.
+_STRIP_CHARS = '"-• \t'
+
+_TODAY_TTL_SECONDS = 60.0
+_today_cache: Dict[str, Any] = {"date": None, "ts": 0.0}
+
+
+def _today_str() -> str:
+    """
+    Get today's date as YYYY-MM-DD, refreshed at most once per minute.
+
+    Returns:
+        Cached formatted date string
+    """
+    now = time.monotonic()
+    if _today_cache["date"] is None or now - _today_cache["ts"] >= _TODAY_TTL_SECONDS:
+        _today_cache["date"] = datetime.now().strftime("%Y-%m-%d")
+        _today_cache["ts"] = now
+    return _today_cache["date"]
+
+
+# Healthy health-check results are reused for this long across instances.
+_HEALTH_TTL_SECONDS = 5.0
+
+_CONTEXT_AGGREGATE_CACHE_SIZE = 64
+_context_aggregate_cache: "OrderedDict[Tuple[str, ...], Dict[str, Any]]" = (
+    OrderedDict()
+)
+
+
+def _aggregate_context(context_documents: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Aggregate employees, statuses, categories and average amount from context.
+
+    Results are memoized by the ids of the aggregated documents so repeated
+    suggestion calls over the same retrieved set skip the metadata walk.
+
+    Args:
+        context_documents: Retrieved context documents
+
+    Returns:
+        Dictionary with employees, statuses, categories and avg_amount
+    """
+    docs = context_documents[:5]
+    doc_ids = tuple(str(doc.get("id") or "") for doc in docs)
+    cacheable = all(doc_ids)
+
+    if cacheable and doc_ids in _context_aggregate_cache:
+        _context_aggregate_cache.move_to_end(doc_ids)
+        return _context_aggregate_cache[doc_ids]
+
+    employees = set()
+    statuses = set()
+    categories = set()
+    amounts = []
+
+    for doc in docs:
+        metadata = doc.get("metadata", {})
+        if metadata.get("employee_name"):
+            employees.add(metadata["employee_name"])
+        if metadata.get("status"):
+            statuses.add(metadata["status"])
+        if metadata.get("categories"):
+            if isinstance(metadata["categories"], list):
+                categories.update(metadata["categories"])
+        if metadata.get("reimbursement_amount"):
+            amounts.append(metadata["reimbursement_amount"])
+
+    aggregate = {
+        "employees": list(employees),
+        "statuses": list(statuses),
+        "categories": list(categories),
+        "avg_amount": statistics.fmean(amounts) if amounts else None,
+    }
+
+    if cacheable:
+        _context_aggregate_cache[doc_ids] = aggregate
+        if len(_context_aggregate_cache) > _CONTEXT_AGGREGATE_CACHE_SIZE:
+            _context_aggregate_cache.popitem(last=False)
+
+    return aggregate
+
 
 class LLMService:
     """
@@ -27,6 +117,11 @@ class LLMService:
     using the Gemini LLM through the Google Gen AI SDK.
     """
 
+    # Shared across instances: routes create a new LLMService per request.
+    _inflight: ClassVar[Dict[str, "asyncio.Task[Any]"]] = {}
+    # Last healthy check result as (monotonic timestamp, result).
+    _health_cache: ClassVar[Optional[Tuple[float, Dict[str, Any]]]] = None
+
     def __init__(self):
         """Initialize the LLM service with Gemini configuration."""
         self.logger = logger
@@ -40,6 +135,20 @@ class LLMService:
 
         self.logger.info("LLM Service initialized with Google Gen AI SDK")
 
+    def _log_error(self, message: str, error: Exception) -> None:
+        """
+        Log an error cheaply, attaching the traceback only at DEBUG level.
+
+        Must be called from inside an ``except`` block.
+
+        Args:
+            message: Description of the failed operation
+            error: The caught exception
+        """
+        self.logger.error("%s: %s", message, error)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("%s traceback", message, exc_info=True)
+
     async def analyze_invoice(
         self, invoice_text: str, policy_text: str, employee_name: str
     ) -> Dict[str, Any]:
@@ -57,8 +166,7 @@ class LLMService:
         self.logger.info(f"Analyzing invoice for employee: {employee_name}")
 
         try:
-            system_prompt = self._get_invoice_analysis_prompt()
-            user_prompt = self._format_invoice_analysis_input(
+            system_prompt, user_prompt = self._build_invoice_prompt(
                 invoice_text, policy_text, employee_name
             )
 
@@ -74,7 +182,7 @@ class LLMService:
             return analysis_result
 
         except Exception as e:
-            self.logger.error(f"Error analyzing invoice: {e}", exc_info=True)
+            self._log_error("Error analyzing invoice", e)
             return {
                 "status": ReimbursementStatus.DECLINED.value,
                 "reason": f"Error during analysis: {str(e)}",
@@ -85,6 +193,27 @@ class LLMService:
                 "policy_violations": [f"Analysis failed: {str(e)}"],
             }
 
+    def _build_invoice_prompt(
+        self, invoice_text: str, policy_text: str, employee_name: str
+    ) -> Tuple[str, str]:
+        """
+        Build the system and user prompts for invoice analysis.
+
+        Args:
+            invoice_text: Invoice content
+            policy_text: Policy content
+            employee_name: Employee name
+
+        Returns:
+            Tuple of (system prompt, user prompt)
+        """
+        return (
+            self._get_invoice_analysis_prompt(),
+            self._format_invoice_analysis_input(
+                invoice_text, policy_text, employee_name
+            ),
+        )
+
     def _get_invoice_analysis_prompt(self) -> str:
         """
         Get the system prompt for structured invoice analysis.
@@ -160,7 +289,7 @@ RESPONSE FORMAT: Return ONLY the JSON object, no additional text or formatting."
             Formatted prompt for analysis
         """
         return f"""EMPLOYEE: {employee_name}
-DATE: {datetime.now().strftime("%Y-%m-%d")}
+DATE: {_today_str()}
 
 HR REIMBURSEMENT POLICY:
 {policy_text}
@@ -188,31 +317,30 @@ Please analyze this invoice against the HR policy and provide your assessment in
 
             if start_idx != -1 and end_idx != 0:
                 json_str = response[start_idx:end_idx]
-                result = json.loads(json_str)
+                parsed = orjson.loads(json_str)
 
                 required_fields = ["status", "reason"]
-                for field in required_fields:
-                    if field not in result:
-                        raise ValueError(f"Missing required field: {field}")
-
-                result["total_amount"] = (
-                    float(result.get("total_amount", 0.0))
-                    if result.get("total_amount") is not None
-                    else 0.0
-                )
-                result["reimbursement_amount"] = (
-                    float(result.get("reimbursement_amount", 0.0))
-                    if result.get("reimbursement_amount") is not None
-                    else 0.0
-                )
-                result.setdefault("currency", "INR")
-                result.setdefault("categories", [])
-                result.setdefault("policy_violations", None)
-
-                if not isinstance(result.get("categories"), list):
-                    result["categories"] = []
-
-                return result
+                for field_name in required_fields:
+                    if field_name not in parsed:
+                        raise ValueError(f"Missing required field: {field_name}")
+
+                total_amount = parsed.get("total_amount")
+                reimbursement_amount = parsed.get("reimbursement_amount")
+                categories = parsed.get("categories")
+
+                return {
+                    "status": parsed["status"],
+                    "reason": parsed["reason"],
+                    "total_amount": float(total_amount)
+                    if total_amount is not None
+                    else 0.0,
+                    "reimbursement_amount": float(reimbursement_amount)
+                    if reimbursement_amount is not None
+                    else 0.0,
+                    "currency": parsed.get("currency", "INR"),
+                    "categories": categories if isinstance(categories, list) else [],
+                    "policy_violations": parsed.get("policy_violations"),
+                }
             else:
                 raise ValueError("No JSON found in response")
 
@@ -248,8 +376,7 @@ Please analyze this invoice against the HR policy and provide your assessment in
         self.logger.info(f"Generating chat response for query: {query[:100]}...")
 
         try:
-            system_prompt = self._get_chat_system_prompt()
-            user_prompt = self._format_chat_input(
+            system_prompt, user_prompt = self._build_chat_prompt(
                 query, context_documents, conversation_history
             )
 
@@ -261,9 +388,31 @@ Please analyze this invoice against the HR policy and provide your assessment in
             return response
 
         except Exception as e:
-            self.logger.error(f"Error generating chat response: {e}", exc_info=True)
+            self._log_error("Error generating chat response", e)
             return f"I apologize, but I encountered an error while processing your request: {str(e)}"
 
+    def _build_chat_prompt(
+        self,
+        query: str,
+        context_documents: List[Dict[str, Any]],
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+    ) -> Tuple[str, str]:
+        """
+        Build the system and user prompts for chat response generation.
+
+        Args:
+            query: User query
+            context_documents: Retrieved context documents
+            conversation_history: Previous conversation
+
+        Returns:
+            Tuple of (system prompt, user prompt)
+        """
+        return (
+            self._get_chat_system_prompt(),
+            self._format_chat_input(query, context_documents, conversation_history),
+        )
+
     def _get_chat_system_prompt(self) -> str:
         """
         Get the system prompt for chatbot interactions.
@@ -452,6 +601,78 @@ Remember: Only provide information that can be found in the context documents. U
 
         return "\n".join(prompt_parts)
 
+    @staticmethod
+    def _build_contents(prompt: str) -> List[types.Content]:
+        """
+        Wrap a prompt in request contents the SDK can send without converting.
+
+        Args:
+            prompt: The full prompt to send to the model
+
+        Returns:
+            Single-element list with the user content
+        """
+        return [types.Content(role="user", parts=[types.Part.from_text(text=prompt)])]
+
+    @staticmethod
+    def _prompt_key(kind: str, prompt: str) -> str:
+        """
+        Build a compact key identifying a request kind and prompt.
+
+        Args:
+            kind: Request kind, so identical prompts with different configs differ
+            prompt: The full prompt sent to the model
+
+        Returns:
+            Hex digest key
+        """
+        digest = hashlib.blake2b(prompt.encode("utf-8"), digest_size=16)
+        return f"{kind}:{digest.hexdigest()}"
+
+    async def _single_flight(
+        self, key: str, request: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Run a model request, sharing the result with concurrent identical calls.
+
+        If a request with the same key is already in flight, await its result
+        instead of issuing a second SDK call. The SDK call runs as a detached
+        task that every caller, including the one that started it, awaits
+        through a shield, so one caller's cancellation never fails the rest.
+
+        Args:
+            key: Request key from _prompt_key
+            request: Factory producing the awaitable SDK call
+
+        Returns:
+            The SDK response
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(request())
+            self._inflight[key] = task
+            task.add_done_callback(partial(self._finish_flight, key))
+        else:
+            self.logger.debug("Joining in-flight LLM request %s", key)
+        return await asyncio.shield(task)
+
+    def _finish_flight(self, key: str, task: "asyncio.Task[Any]") -> None:
+        """
+        Forget a finished shared request.
+
+        The request runs as its own task, so a caller being cancelled never
+        cancels it for the others; its error is marked as retrieved here in
+        case every caller has gone away.
+
+        Args:
+            key: Request key from _prompt_key
+            task: The finished request task
+        """
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+
     async def _generate_response(self, prompt: str) -> str:
         """
         Generate response using Google Gen AI SDK.
@@ -463,12 +684,15 @@ Remember: Only provide information that can be found in the context documents. U
             Generated response text
         """
         try:
-            response = await self.client.aio.models.generate_content(
-                model=self.model_name,
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    temperature=settings.LLM_TEMPERATURE,
-                    max_output_tokens=settings.MAX_TOKENS,
+            response = await self._single_flight(
+                self._prompt_key("text", prompt),
+                lambda: self.client.aio.models.generate_content(
+                    model=self.model_name,
+                    contents=self._build_contents(prompt),
+                    config=types.GenerateContentConfig(
+                        temperature=settings.LLM_TEMPERATURE,
+                        max_output_tokens=settings.MAX_TOKENS,
+                    ),
                 ),
             )
 
@@ -489,12 +713,15 @@ Remember: Only provide information that can be found in the context documents. U
             self.logger.error(f"Error generating response: {e}")
             raise
 
-    async def generate_streaming_response(self, prompt: str):
+    async def generate_streaming_response(
+        self, prompt: str, contents: Optional[List[types.Content]] = None
+    ):
         """
         Generate streaming response using Google Gen AI SDK with optimized streaming.
 
         Args:
             prompt: The full prompt to send to the model
+            contents: Optional pre-built request contents for ``prompt``
 
         Yields:
             Generated response chunks as they are produced
@@ -502,7 +729,7 @@ Remember: Only provide information that can be found in the context documents. U
         try:
             stream = await self.client.aio.models.generate_content_stream(
                 model=self.model_name,
-                contents=prompt,
+                contents=contents or self._build_contents(prompt),
                 config=types.GenerateContentConfig(
                     temperature=settings.LLM_TEMPERATURE,
                     max_output_tokens=settings.MAX_TOKENS,
@@ -512,6 +739,14 @@ Remember: Only provide information that can be found in the context documents. U
             chunk_count = 0
             total_tokens = 0
 
+            # Coalesce upstream chunks: flush the first one immediately, then
+            # grow the batch threefold up to STREAM_BATCH_SIZE tokens, or flush
+            # whatever is pending once STREAM_FLUSH_INTERVAL has elapsed.
+            pending: List[str] = []
+            pending_tokens = 0
+            batch_target = 1
+            last_flush = time.monotonic()
+
             async for chunk in stream:
                 if chunk.candidates and len(chunk.candidates) > 0:
                     candidate = chunk.candidates[0]
@@ -519,14 +754,32 @@ Remember: Only provide information that can be found in the context documents. U
                         text = candidate.content.parts[0].text
                         if text is not None and text.strip():
                             chunk_count += 1
-                            total_tokens += len(text.split())
+                            chunk_tokens = len(text.split())
+                            total_tokens += chunk_tokens
 
                             if chunk_count % 10 == 0:
                                 self.logger.debug(
                                     f"Streaming progress: {chunk_count} chunks, ~{total_tokens} tokens"
                                 )
 
-                            yield text
+                            pending.append(text)
+                            pending_tokens += chunk_tokens
+
+                            now = time.monotonic()
+                            if (
+                                pending_tokens >= batch_target
+                                or now - last_flush >= settings.STREAM_FLUSH_INTERVAL
+                            ):
+                                yield "".join(pending)
+                                pending.clear()
+                                pending_tokens = 0
+                                last_flush = now
+                                batch_target = min(
+                                    batch_target * 3, settings.STREAM_BATCH_SIZE
+                                )
+
+            if pending:
+                yield "".join(pending)
 
             self.logger.info(
                 f"Streaming completed: {chunk_count} chunks, ~{total_tokens} tokens"
@@ -558,8 +811,7 @@ Remember: Only provide information that can be found in the context documents. U
         )
 
         try:
-            system_prompt = self._get_chat_system_prompt()
-            user_prompt = self._format_chat_input(
+            system_prompt, user_prompt = self._build_chat_prompt(
                 query, context_documents, conversation_history
             )
 
@@ -571,9 +823,7 @@ Remember: Only provide information that can be found in the context documents. U
             self.logger.info("Streaming chat response completed successfully")
 
         except Exception as e:
-            self.logger.error(
-                f"Error generating streaming chat response: {e}", exc_info=True
-            )
+            self._log_error("Error generating streaming chat response", e)
             yield f"I apologize, but I encountered an error while processing your request: {str(e)}"
 
     async def generate_query_suggestions(
@@ -609,7 +859,7 @@ Remember: Only provide information that can be found in the context documents. U
             return suggestions
 
         except Exception as e:
-            self.logger.error(f"Error generating query suggestions: {e}", exc_info=True)
+            self._log_error("Error generating query suggestions", e)
             return self._get_fallback_suggestions(query_type)
 
     def _get_suggestion_system_prompt(self) -> str:
@@ -670,32 +920,20 @@ EXAMPLE SUGGESTIONS:
         if context_documents:
             prompt_parts.append("AVAILABLE DATA CONTEXT:")
 
-            employees = set()
-            statuses = set()
-            categories = set()
-            amounts = []
-
-            for doc in context_documents[:5]:
-                metadata = doc.get("metadata", {})
-                if metadata.get("employee_name"):
-                    employees.add(metadata["employee_name"])
-                if metadata.get("status"):
-                    statuses.add(metadata["status"])
-                if metadata.get("categories"):
-                    if isinstance(metadata["categories"], list):
-                        categories.update(metadata["categories"])
-                if metadata.get("reimbursement_amount"):
-                    amounts.append(metadata["reimbursement_amount"])
-
-            if employees:
-                prompt_parts.append(f"- Employees: {', '.join(list(employees)[:3])}")
-            if statuses:
-                prompt_parts.append(f"- Statuses: {', '.join(list(statuses))}")
-            if categories:
-                prompt_parts.append(f"- Categories: {', '.join(list(categories)[:5])}")
-            if amounts:
-                avg_amount = sum(amounts) / len(amounts)
-                prompt_parts.append(f"- Average amount: ₹{avg_amount:.0f}")
+            aggregate = _aggregate_context(context_documents)
+
+            if aggregate["employees"]:
+                prompt_parts.append(
+                    f"- Employees: {', '.join(aggregate['employees'][:3])}"
+                )
+            if aggregate["statuses"]:
+                prompt_parts.append(f"- Statuses: {', '.join(aggregate['statuses'])}")
+            if aggregate["categories"]:
+                prompt_parts.append(
+                    f"- Categories: {', '.join(aggregate['categories'][:5])}"
+                )
+            if aggregate["avg_amount"] is not None:
+                prompt_parts.append(f"- Average amount: ₹{aggregate['avg_amount']:.0f}")
 
             prompt_parts.append("")
 
@@ -723,7 +961,7 @@ EXAMPLE SUGGESTIONS:
 
             if start_idx != -1 and end_idx != 0:
                 json_str = response[start_idx:end_idx]
-                suggestions = json.loads(json_str)
+                suggestions = orjson.loads(json_str)
 
                 if isinstance(suggestions, list):
                     cleaned_suggestions = []
@@ -738,12 +976,8 @@ EXAMPLE SUGGESTIONS:
             suggestions = []
             for line in lines:
                 line = line.strip()
-                if line and (
-                    line.startswith('"') or line.startswith("-") or line.startswith("•")
-                ):
-                    suggestion = (
-                        line.replace('"', "").replace("-", "").replace("•", "").strip()
-                    )
+                if line and line[0] in _BULLET_CHARS:
+                    suggestion = line.lstrip(_STRIP_CHARS).rstrip('",').strip()
                     if len(suggestion) > 5:
                         suggestions.append(suggestion)
                         if len(suggestions) >= 5:
@@ -822,11 +1056,12 @@ EXAMPLE SUGGESTIONS:
                 "data": {"status": "starting", "employee": employee_name},
             }
 
-            system_prompt = self._get_invoice_analysis_prompt()
-            user_prompt = self._format_invoice_analysis_input(
+            system_prompt, user_prompt = self._build_invoice_prompt(
                 invoice_text, policy_text, employee_name
             )
             full_prompt = f"{system_prompt}\n\n{user_prompt}"
+            # Built once and reused if the structured call falls back to streaming
+            contents = self._build_contents(full_prompt)
 
             yield {
                 "type": "invoice_analysis",
@@ -834,7 +1069,9 @@ EXAMPLE SUGGESTIONS:
             }
 
             try:
-                result = await self._generate_structured_invoice_response(full_prompt)
+                result = await self._generate_structured_invoice_response(
+                    full_prompt, contents=contents
+                )
 
                 yield {
                     "type": "invoice_analysis",
@@ -857,7 +1094,9 @@ EXAMPLE SUGGESTIONS:
                 full_response = ""
                 chunk_count = 0
 
-                async for chunk in self.generate_streaming_response(full_prompt):
+                async for chunk in self.generate_streaming_response(
+                    full_prompt, contents=contents
+                ):
                     chunk_count += 1
                     full_response += chunk
 
@@ -871,11 +1110,6 @@ EXAMPLE SUGGESTIONS:
                             },
                         }
 
-                yield {
-                    "type": "invoice_analysis",
-                    "data": {"status": "parsing", "stage": "response_parsing"},
-                }
-
                 result = self._parse_invoice_analysis_response(full_response)
 
                 yield {
@@ -889,9 +1123,7 @@ EXAMPLE SUGGESTIONS:
                 }
 
         except Exception as e:
-            self.logger.error(
-                f"Error in streaming invoice analysis: {e}", exc_info=True
-            )
+            self._log_error("Error in streaming invoice analysis", e)
             yield {
                 "type": "invoice_analysis",
                 "data": {"status": "error", "error": str(e)},
@@ -907,32 +1139,38 @@ EXAMPLE SUGGESTIONS:
         Raises:
             Exception: If health check fails
         """
+        cached = LLMService._health_cache
+        if (
+            cached is not None
+            and cached[1]["model"] == self.model_name
+            and time.monotonic() - cached[0] < _HEALTH_TTL_SECONDS
+        ):
+            return cached[1]
+
         try:
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents="Health check test",
-                config=types.GenerateContentConfig(
-                    temperature=0.1, max_output_tokens=10
-                ),
-            )
+            model = await self.client.aio.models.get(model=self.model_name)
 
-            return {
+            result = {
                 "status": "healthy",
                 "model": self.model_name,
-                "response_received": response.text is not None,
+                "response_received": model is not None,
             }
+            LLMService._health_cache = (time.monotonic(), result)
+            return result
         except Exception as e:
+            LLMService._health_cache = None
             self.logger.error(f"LLM service health check failed: {e}")
             raise Exception(f"LLM service unhealthy: {str(e)}")
 
     async def _generate_structured_invoice_response(
-        self, prompt: str
+        self, prompt: str, contents: Optional[List[types.Content]] = None
     ) -> LLMInvoiceAnalysisResponse:
         """
         Generate structured invoice analysis response using Google Gen AI SDK with response schema.
 
         Args:
             prompt: The full prompt to send to the model
+            contents: Optional pre-built request contents for ``prompt``
 
         Returns:
             Validated LLMInvoiceAnalysisResponse object
@@ -943,14 +1181,17 @@ EXAMPLE SUGGESTIONS:
         try:
             response_schema = LLMInvoiceAnalysisResponse.model_json_schema()
 
-            response = await self.client.aio.models.generate_content(
-                model=self.model_name,
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    temperature=settings.LLM_TEMPERATURE,
-                    max_output_tokens=settings.MAX_TOKENS,
-                    response_mime_type="application/json",
-                    response_schema=response_schema,
+            response = await self._single_flight(
+                self._prompt_key("structured_invoice", prompt),
+                lambda: self.client.aio.models.generate_content(
+                    model=self.model_name,
+                    contents=contents or self._build_contents(prompt),
+                    config=types.GenerateContentConfig(
+                        temperature=settings.LLM_TEMPERATURE,
+                        max_output_tokens=settings.MAX_TOKENS,
+                        response_mime_type="application/json",
+                        response_schema=response_schema,
+                    ),
                 ),
             )
 
@@ -960,7 +1201,7 @@ EXAMPLE SUGGESTIONS:
                     response_text = candidate.content.parts[0].text
                     if response_text is not None:
                         try:
-                            response_data = json.loads(response_text)
+                            response_data = orjson.loads(response_text)
                             validated_response = LLMInvoiceAnalysisResponse(
                                 **response_data
                             )
@@ -968,7 +1209,7 @@ EXAMPLE SUGGESTIONS:
                                 "Successfully generated and validated structured response"
                             )
                             return validated_response
-                        except json.JSONDecodeError as e:
+                        except orjson.JSONDecodeError as e:
                             self.logger.error(f"Failed to parse JSON response: {e}")
                             raise ValueError(f"Invalid JSON response: {e}")
                         except Exception as e:
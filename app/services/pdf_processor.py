@@ -6,13 +6,185 @@ invoice documents and HR policy documents.
 """
 
 import asyncio
+import contextlib
+import io
 import logging
-from pathlib import Path
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, ClassVar, Iterator, List, Optional, Tuple
 
-import PyPDF2
+import pymupdf
 
 logger = logging.getLogger(__name__)
 
+# Documents with fewer pages are extracted inline; process start-up and
+# pickling would cost more than the extraction itself.
+_PARALLEL_MIN_PAGES = 8
+# Worker processes in the page pool; each task gets an equal share of pages.
+_PAGE_WORKERS = os.cpu_count() or 1
+# Maximum number of documents kept in each extraction result cache.
+_RESULT_CACHE_SIZE = 64
+# Bytes at the end of the file searched for the "%%EOF" marker.
+_TRAILER_SCAN_SIZE = 1024
+# Text-page flags: keep layout whitespace and clip to the media box, but skip
+# ligature preservation and CID placeholder glyphs that the LLM cannot use.
+_TEXT_FLAGS = pymupdf.TEXT_PRESERVE_WHITESPACE | pymupdf.TEXT_MEDIABOX_CLIP
+# MuPDF's global context (resource store, fonts) is shared by every document
+# and is not thread-safe, even with one Document per thread, so in-process
+# PyMuPDF calls from worker threads run one at a time. It is held per open,
+# close or page, never while waiting on the page pool, whose workers have their
+# own MuPDF context.
+_MUPDF_LOCK = threading.RLock()
+# Documents opened through _open_pdf() and not yet closed, guarded by
+# _MUPDF_LOCK. The shared resource store is only shrunk once this reaches zero,
+# so closing one document does not evict resources another is still using.
+_open_docs = 0
+
+
+def _open_pdf(pdf_path: str) -> pymupdf.Document:
+    """
+    Open a PDF, reporting a missing file as FileNotFoundError.
+
+    PyMuPDF already checks that the path exists before opening it, so callers
+    do not need a separate exists() check.
+
+    Args:
+        pdf_path: Path to the PDF file
+
+    Returns:
+        Open PyMuPDF document
+
+    Raises:
+        FileNotFoundError: If the PDF file doesn't exist
+    """
+    global _open_docs
+
+    with _MUPDF_LOCK:
+        try:
+            doc = pymupdf.open(pdf_path)
+        except pymupdf.FileNotFoundError:
+            raise FileNotFoundError(f"PDF file not found: {pdf_path}") from None
+        _open_docs += 1
+        return doc
+
+
+def _close_pdf(doc: pymupdf.Document) -> None:
+    """
+    Close a document opened by _open_pdf().
+
+    MuPDF's resource store is emptied once the last open document is closed,
+    so a long-running server does not keep every parsed font and image.
+
+    Args:
+        doc: Document returned by _open_pdf()
+    """
+    global _open_docs
+
+    with _MUPDF_LOCK:
+        doc.close()
+        _open_docs -= 1
+        if _open_docs == 0:
+            pymupdf.TOOLS.store_shrink(100)
+
+
+@contextlib.contextmanager
+def _opened(pdf_path: str) -> Iterator[pymupdf.Document]:
+    """
+    Open a PDF with _open_pdf() and close it with _close_pdf() on exit.
+
+    Args:
+        pdf_path: Path to the PDF file
+
+    Yields:
+        Open PyMuPDF document
+    """
+    doc = _open_pdf(pdf_path)
+    try:
+        yield doc
+    finally:
+        _close_pdf(doc)
+
+
+def _authenticate(doc: pymupdf.Document) -> None:
+    """
+    Unlock an encrypted document with the empty user password.
+
+    MuPDF keeps the decryption state on the open document, so this is done
+    once per open and every page read afterwards is already decrypted.
+
+    Args:
+        doc: Open PyMuPDF document
+
+    Raises:
+        ValueError: If the document requires a non-empty password
+    """
+    if doc.needs_pass and not doc.authenticate(""):
+        raise ValueError("PDF is encrypted and cannot be read")
+
+
+def _page_text(
+    page: pymupdf.Page, graphics_heavy_threshold: Optional[int] = None
+) -> Optional[str]:
+    """
+    Extract text from a page through a text-only text page.
+
+    Args:
+        page: Page to extract text from
+        graphics_heavy_threshold: Content stream size in bytes above which
+            the page is skipped, or None to extract every page
+
+    Returns:
+        Text content of the page, or None if the page was skipped
+    """
+    if graphics_heavy_threshold is not None:
+        doc = page.parent
+        content_size = sum(
+            len(doc.xref_stream_raw(xref)) for xref in page.get_contents()
+        )
+        if content_size > graphics_heavy_threshold:
+            return None
+
+    textpage = page.get_textpage(flags=_TEXT_FLAGS)
+    return page.get_text("text", textpage=textpage)
+
+
+def _extract_page_range(
+    pdf_path: str,
+    start: int,
+    stop: int,
+    graphics_heavy_threshold: Optional[int] = None,
+) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    Extract text from a range of pages in a worker process.
+
+    The document is opened and closed within the task, so workers hold no
+    file handles or parsed documents between tasks.
+
+    Args:
+        pdf_path: Path to the PDF file
+        start: First zero-based page index
+        stop: Page index to stop before
+        graphics_heavy_threshold: Content stream size above which a page is skipped
+
+    Returns:
+        (text, error) for each page; text is None if the page failed or was
+        skipped, and error describes the failure
+    """
+    results: List[Tuple[Optional[str], Optional[str]]] = []
+    with _opened(pdf_path) as doc:
+        _authenticate(doc)
+        for page_idx in range(start, stop):
+            try:
+                results.append(
+                    (_page_text(doc[page_idx], graphics_heavy_threshold), None)
+                )
+            except Exception as e:
+                results.append((None, str(e)))
+    return results
+
 
 class PDFProcessor:
     """
@@ -22,16 +194,92 @@ class PDFProcessor:
     and support for various PDF formats.
     """
 
-    def __init__(self):
-        """Initialize the PDF processor."""
+    _page_executor: ClassVar[Optional[ProcessPoolExecutor]] = None
+    _page_executor_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    # Processors are created per request, so results are cached on the class
+    # to survive retries and re-analysis of the same upload.
+    _text_cache: ClassVar[OrderedDict[str, str]] = OrderedDict()
+    _metadata_cache: ClassVar[OrderedDict[str, dict]] = OrderedDict()
+    _page_count_cache: ClassVar[OrderedDict[str, int]] = OrderedDict()
+    _cache_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, graphics_heavy_threshold: Optional[int] = None):
+        """
+        Initialize the PDF processor.
+
+        Args:
+            graphics_heavy_threshold: Content stream size in bytes above which a
+                page is treated as graphics-only and skipped. None keeps every page.
+        """
         self.logger = logger
+        self.graphics_heavy_threshold = graphics_heavy_threshold
+
+    @staticmethod
+    def _cache_key(pdf_path: str) -> str:
+        """
+        Build a cache key that changes whenever the file is rewritten.
 
-    async def extract_text(self, pdf_path: str) -> str:
+        Args:
+            pdf_path: Path to the PDF file
+
+        Returns:
+            Key combining modification time, size and path
+        """
+        stat = os.stat(pdf_path)
+        return f"{stat.st_mtime_ns}:{stat.st_size}:{pdf_path}"
+
+    def _text_cache_key(self, file_key: str, max_pages: Optional[int]) -> str:
+        """
+        Extend a file cache key with the options that change extracted text.
+
+        Args:
+            file_key: Key returned by _cache_key
+            max_pages: Page limit of the extraction
+
+        Returns:
+            Key for the text cache
+        """
+        return f"{file_key}:{self.graphics_heavy_threshold}:{max_pages}"
+
+    @classmethod
+    def _cache_get(cls, cache: OrderedDict, key: str) -> Optional[Any]:
+        """Return a cached value and mark it as recently used, or None on a miss."""
+        with cls._cache_lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+            return value
+
+    @classmethod
+    def _cache_put(cls, cache: OrderedDict, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        with cls._cache_lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            if len(cache) > _RESULT_CACHE_SIZE:
+                cache.popitem(last=False)
+
+    @classmethod
+    def _get_page_executor(cls) -> ProcessPoolExecutor:
+        """Get the process pool shared by all processors, creating it on first use."""
+        with cls._page_executor_lock:
+            if cls._page_executor is None:
+                # Spawned workers do not inherit the parent's MuPDF state, open
+                # documents or held locks, which fork would copy mid-use.
+                cls._page_executor = ProcessPoolExecutor(
+                    max_workers=_PAGE_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return cls._page_executor
+
+    async def extract_text(self, pdf_path: str, max_pages: Optional[int] = None) -> str:
         """
         Extract text content from a PDF file.
 
         Args:
             pdf_path: Path to the PDF file
+            max_pages: Stop after this many pages, or None to read the whole document
 
         Returns:
             Extracted text content
@@ -41,69 +289,183 @@ class PDFProcessor:
             ValueError: If text extraction fails
         """
         try:
-            return await asyncio.get_event_loop().run_in_executor(
-                None, self._extract_text_sync, pdf_path
-            )
+            return await asyncio.to_thread(self._extract_text_sync, pdf_path, max_pages)
         except Exception as e:
             self.logger.error(f"Error extracting text from PDF {pdf_path}: {e}")
             raise ValueError(f"Failed to extract text from PDF: {str(e)}")
 
-    def _extract_text_sync(self, pdf_path: str) -> str:
+    def _extract_text_sync(self, pdf_path: str, max_pages: Optional[int] = None) -> str:
         """
         Synchronous text extraction from PDF.
 
         Args:
             pdf_path: Path to the PDF file
+            max_pages: Stop after this many pages, or None to read the whole document
 
         Returns:
             Extracted text content
         """
-        pdf_file = Path(pdf_path)
-
-        if not pdf_file.exists():
-            raise FileNotFoundError(f"PDF file not found: {pdf_path}")
-
-        text_content = []
-
+        # The stat behind the cache key doubles as the existence check.
         try:
-            with open(pdf_path, "rb") as file:
-                pdf_reader = PyPDF2.PdfReader(file)
+            file_key = self._cache_key(pdf_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"PDF file not found: {pdf_path}") from None
 
-                if pdf_reader.is_encrypted:
-                    self.logger.warning(
-                        f"PDF {pdf_path} is encrypted, attempting to decrypt"
-                    )
-                    if not pdf_reader.decrypt(""):
-                        raise ValueError("PDF is encrypted and cannot be read")
-
-                for page_num, page in enumerate(pdf_reader.pages):
-                    try:
-                        page_text = page.extract_text()
-                        if page_text.strip():
-                            text_content.append(page_text)
-                            self.logger.debug(
-                                f"Extracted text from page {page_num + 1}"
-                            )
-                    except Exception as e:
-                        self.logger.warning(
-                            f"Error extracting text from page {page_num + 1}: {e}"
-                        )
-                        continue
+        cache_key = self._text_cache_key(file_key, max_pages)
+        cached_text = self._cache_get(self._text_cache, cache_key)
+        if cached_text is not None:
+            self.logger.debug(f"Using cached text for {pdf_path}")
+            return cached_text
 
+        try:
+            with _opened(pdf_path) as doc:
+                extracted_text = self._read_doc_text(doc, pdf_path, max_pages)
+        except FileNotFoundError:
+            raise
         except Exception as e:
             self.logger.error(f"Error reading PDF file {pdf_path}: {e}")
             raise ValueError(f"Cannot read PDF file: {str(e)}")
 
-        if not text_content:
+        if not extracted_text:
             raise ValueError("No text content could be extracted from the PDF")
 
-        extracted_text = "\n\n".join(text_content)
         self.logger.info(
             f"Successfully extracted {len(extracted_text)} characters from {pdf_path}"
         )
 
+        self._cache_put(self._text_cache, cache_key, extracted_text)
         return extracted_text
 
+    def _read_doc_text(
+        self, doc: pymupdf.Document, pdf_path: str, max_pages: Optional[int] = None
+    ) -> str:
+        """
+        Extract text from an already-open document.
+
+        Args:
+            doc: Open PyMuPDF document
+            pdf_path: Path the document was opened from
+            max_pages: Stop after this many pages, or None to read the whole document
+
+        Returns:
+            Text of all non-empty pages, or an empty string if there is none
+        """
+        page_texts = self._read_page_texts(doc, pdf_path, max_pages)
+
+        buf = io.StringIO()
+        pages_written = 0
+        for page_text in page_texts:
+            if page_text and page_text.strip():
+                if pages_written:
+                    buf.write("\n\n")
+                buf.write(page_text)
+                pages_written += 1
+
+        self.logger.debug(
+            "Extracted text from %d/%d pages of %s",
+            pages_written,
+            len(page_texts),
+            pdf_path,
+        )
+        return buf.getvalue()
+
+    def _read_page_texts(
+        self, doc: pymupdf.Document, pdf_path: str, max_pages: Optional[int] = None
+    ) -> List[Optional[str]]:
+        """
+        Extract the text of each page of an already-open document.
+
+        Args:
+            doc: Open PyMuPDF document
+            pdf_path: Path the document was opened from
+            max_pages: Stop after this many pages, or None to read the whole document
+
+        Returns:
+            Page texts in page order, None for pages that failed or were skipped
+        """
+        with _MUPDF_LOCK:
+            if doc.needs_pass:
+                self.logger.warning(
+                    f"PDF {pdf_path} is encrypted, attempting to decrypt"
+                )
+                _authenticate(doc)
+
+            page_count = doc.page_count
+        if max_pages is not None and page_count > max_pages:
+            self.logger.info(
+                f"Limiting extraction of {pdf_path} to {max_pages} of {page_count} pages"
+            )
+            page_count = max_pages
+
+        if page_count >= _PARALLEL_MIN_PAGES:
+            page_texts = self._extract_pages_parallel(pdf_path, page_count)
+        else:
+            page_texts = []
+            for page_num in range(page_count):
+                try:
+                    with _MUPDF_LOCK:
+                        page_text = _page_text(
+                            doc[page_num], self.graphics_heavy_threshold
+                        )
+                    page_texts.append(page_text)
+                except Exception as e:
+                    self.logger.warning(
+                        "Error extracting text from page %d: %s", page_num + 1, e
+                    )
+                    page_texts.append(None)
+
+        return page_texts
+
+    def _extract_pages_parallel(
+        self, pdf_path: str, page_count: int
+    ) -> List[Optional[str]]:
+        """
+        Extract page texts across the shared process pool.
+
+        Args:
+            pdf_path: Path to the PDF file
+            page_count: Number of pages in the document
+
+        Returns:
+            Page texts in page order, None for pages that failed
+        """
+        executor = self._get_page_executor()
+        pages_per_task = -(-page_count // _PAGE_WORKERS)
+        ranges = [
+            (start, min(start + pages_per_task, page_count))
+            for start in range(0, page_count, pages_per_task)
+        ]
+        futures = [
+            executor.submit(
+                _extract_page_range,
+                pdf_path,
+                start,
+                stop,
+                self.graphics_heavy_threshold,
+            )
+            for start, stop in ranges
+        ]
+
+        page_texts: List[Optional[str]] = []
+        for (start, stop), future in zip(ranges, futures):
+            try:
+                results = future.result()
+            except Exception as e:
+                self.logger.warning(
+                    "Error extracting text from pages %d-%d: %s", start + 1, stop, e
+                )
+                page_texts.extend([None] * (stop - start))
+                continue
+
+            for page_num, (page_text, error) in enumerate(results, start):
+                if error is not None:
+                    self.logger.warning(
+                        "Error extracting text from page %d: %s", page_num + 1, error
+                    )
+                page_texts.append(page_text)
+
+        return page_texts
+
     async def extract_metadata(self, pdf_path: str) -> dict:
         """
         Extract metadata from a PDF file.
@@ -115,9 +477,7 @@ class PDFProcessor:
             Dictionary containing PDF metadata
         """
         try:
-            return await asyncio.get_event_loop().run_in_executor(
-                None, self._extract_metadata_sync, pdf_path
-            )
+            return await asyncio.to_thread(self._extract_metadata_sync, pdf_path)
         except Exception as e:
             self.logger.error(f"Error extracting metadata from PDF {pdf_path}: {e}")
             return {}
@@ -133,51 +493,85 @@ class PDFProcessor:
             Dictionary containing PDF metadata
         """
         try:
-            with open(pdf_path, "rb") as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-
-                metadata = {
-                    "num_pages": len(pdf_reader.pages),
-                    "is_encrypted": pdf_reader.is_encrypted,
-                }
+            cache_key = self._cache_key(pdf_path)
+            cached_metadata = self._cache_get(self._metadata_cache, cache_key)
+            if cached_metadata is not None:
+                return dict(cached_metadata)
 
-                if pdf_reader.metadata:
-                    info = pdf_reader.metadata
-                    metadata.update(
-                        {
-                            "title": getattr(info, "title", None),
-                            "author": getattr(info, "author", None),
-                            "subject": getattr(info, "subject", None),
-                            "creator": getattr(info, "creator", None),
-                            "producer": getattr(info, "producer", None),
-                            "creation_date": getattr(info, "creation_date", None),
-                            "modification_date": getattr(
-                                info, "modification_date", None
-                            ),
-                        }
-                    )
-
-                return metadata
+            with _opened(pdf_path) as doc, _MUPDF_LOCK:
+                metadata = self._read_doc_metadata(doc)
 
+            self._cache_put(self._metadata_cache, cache_key, dict(metadata))
+            return metadata
         except Exception as e:
             self.logger.error(f"Error extracting metadata from {pdf_path}: {e}")
             return {"error": str(e)}
 
-    def validate_pdf(self, pdf_path: str) -> bool:
+    @staticmethod
+    def _read_doc_metadata(doc: pymupdf.Document) -> dict:
+        """
+        Collect metadata from an already-open document.
+
+        Args:
+            doc: Open PyMuPDF document
+
+        Returns:
+            Dictionary containing PDF metadata
+        """
+        metadata = {
+            "num_pages": doc.page_count,
+            "is_encrypted": doc.is_encrypted,
+        }
+
+        if doc.metadata:
+            info = doc.metadata
+            metadata.update(
+                {
+                    "title": info.get("title") or None,
+                    "author": info.get("author") or None,
+                    "subject": info.get("subject") or None,
+                    "creator": info.get("creator") or None,
+                    "producer": info.get("producer") or None,
+                    "creation_date": info.get("creationDate") or None,
+                    "modification_date": info.get("modDate") or None,
+                }
+            )
+
+        return metadata
+
+    def validate_pdf(self, pdf_path: str, strict: bool = False) -> bool:
         """
         Validate if a file is a valid PDF.
 
+        By default only the "%PDF-" header and the "%%EOF" marker near the end
+        of the file are checked, which rejects garbage uploads without parsing.
+
         Args:
             pdf_path: Path to the PDF file
+            strict: Also open the document with the parser and load its first page
 
         Returns:
             True if valid PDF, False otherwise
         """
         try:
-            with open(pdf_path, "rb") as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                if len(pdf_reader.pages) > 0:
-                    _ = pdf_reader.pages[0]
+            with open(pdf_path, "rb") as f:
+                head = f.read(8)
+                size = f.seek(0, os.SEEK_END)
+                f.seek(max(size - _TRAILER_SCAN_SIZE, 0))
+                tail = f.read()
+
+            if not head.startswith(b"%PDF-") or b"%%EOF" not in tail:
+                self.logger.error(
+                    f"PDF validation failed for {pdf_path}: missing PDF header or trailer"
+                )
+                return False
+
+            if not strict:
+                return True
+
+            with _opened(pdf_path) as doc, _MUPDF_LOCK:
+                if doc.page_count > 0:
+                    _ = doc[0]
                 return True
         except Exception as e:
             self.logger.error(f"PDF validation failed for {pdf_path}: {e}")
@@ -194,9 +588,7 @@ class PDFProcessor:
             Number of pages in the PDF
         """
         try:
-            return await asyncio.get_event_loop().run_in_executor(
-                None, self._get_page_count_sync, pdf_path
-            )
+            return await asyncio.to_thread(self._get_page_count_sync, pdf_path)
         except Exception as e:
             self.logger.error(f"Error getting page count from PDF {pdf_path}: {e}")
             return 0
@@ -212,9 +604,16 @@ class PDFProcessor:
             Number of pages in the PDF
         """
         try:
-            with open(pdf_path, "rb") as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                return len(pdf_reader.pages)
+            cache_key = self._cache_key(pdf_path)
+            cached_count = self._cache_get(self._page_count_cache, cache_key)
+            if cached_count is not None:
+                return cached_count
+
+            with _opened(pdf_path) as doc, _MUPDF_LOCK:
+                page_count = doc.page_count
+
+            self._cache_put(self._page_count_cache, cache_key, page_count)
+            return page_count
         except Exception as e:
             self.logger.error(f"Error getting page count from {pdf_path}: {e}")
             return 0
@@ -6,27 +6,283 @@ and retrieving invoice analysis embeddings.
 """
 
 import asyncio
+import hashlib
 import logging
+import re
+import time
 import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
 
-from qdrant_client import QdrantClient
+import grpc
+import numpy as np
+import torch
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.exceptions import ResponseHandlingException, UnexpectedResponse
 from qdrant_client.http.models import (
+    Batch,
     Distance,
     FieldCondition,
     Filter,
+    HnswConfigDiff,
     MatchValue,
-    PointStruct,
+    PayloadSelectorInclude,
+    QuantizationSearchParams,
+    QueryRequest,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
     VectorParams,
 )
 from sentence_transformers import SentenceTransformer
 
-from app.core.config import settings
+from app.core.config import EmbeddingBackend, settings
 from app.models.schemas import SearchResult, VectorDocument
 
 logger = logging.getLogger(__name__)
 
+# How long an embedding request waits for the background model load to finish.
+_MODEL_READY_TIMEOUT_SECONDS = 60.0
+# Texts passed to the embedding model per forward pass in batch encoding.
+_EMBEDDING_BATCH_SIZE = 64
+# Embeddings remembered by content hash, so repeated texts skip the model.
+_EMBEDDING_CACHE_SIZE = 4096
+# Generous characters-per-token bound: text past max_seq_length * this many
+# characters is beyond the model's token window and would only be tokenized
+# to be thrown away.
+_EMBEDDING_CHARS_PER_TOKEN = 6
+# gRPC message ceiling, large enough for bulk upserts of full invoice payloads.
+_GRPC_MAX_MESSAGE_BYTES = 100 << 20
+# Keepalive pings stop idle load balancers from silently dropping the gRPC
+# channel, so the first request after a quiet period does not pay for a
+# reconnect. Five minutes is the shortest interval gRPC servers accept by default.
+_GRPC_OPTIONS = {
+    "grpc.max_send_message_length": _GRPC_MAX_MESSAGE_BYTES,
+    "grpc.keepalive_time_ms": 300_000,
+    "grpc.keepalive_timeout_ms": 10_000,
+    "grpc.keepalive_permit_without_calls": 1,
+}
+# Vectors are also stored as int8 (scalar quantization), kept in RAM.
+_QUANTIZATION_CONFIG = ScalarQuantization(
+    scalar=ScalarQuantizationConfig(
+        type=ScalarType.INT8, quantile=0.99, always_ram=True
+    )
+)
+# Vector searches walk the HNSW graph with ef=64 over the in-RAM int8 vectors,
+# over-fetching 2x candidates and rescoring them against the FP32 originals.
+_SEARCH_PARAMS = SearchParams(
+    hnsw_ef=64,
+    exact=False,
+    quantization=QuantizationSearchParams(rescore=True, oversampling=2.0),
+)
+# Collection metadata (listing, point counts) is reused for this long.
+_METADATA_TTL_SECONDS = 5.0
+# Failures that mean Qdrant is unreachable or unhappy, rather than a bug here.
+_QDRANT_UNAVAILABLE_ERRORS = (
+    ConnectionError,
+    TimeoutError,
+    ResponseHandlingException,
+    UnexpectedResponse,
+    grpc.RpcError,
+)
+# Namespace for deterministic invoice point IDs derived from employee and file hash.
+_INVOICE_NAMESPACE = uuid.UUID("48da2438-0c91-4af7-8445-401eaead9f2b")
+# Payload fields the duplicate checks return for each document type.
+_EXISTENCE_FIELDS = {
+    "invoice_analysis": [
+        "status",
+        "reason",
+        "total_amount",
+        "reimbursement_amount",
+        "currency",
+        "categories",
+        "policy_violations",
+    ],
+    "policy": ["content", "embedding_model"],
+}
+# Positive duplicate-check results remembered per (file hash, doc type).
+_EXISTS_CACHE_SIZE = 1024
+# How long a remembered duplicate-check result stays valid.
+_EXISTS_TTL_SECONDS = 30.0
+# Single-text embedding requests waiting to be encoded together.
+_EMBED_QUEUE_SIZE = 1024
+# Single-document writes waiting for the batching writer; puts block when full.
+_WRITE_QUEUE_SIZE = 256
+# Most points the writer embeds and upserts in one round trip.
+_WRITE_BATCH_SIZE = 256
+# How long the writer waits for more documents before flushing a batch.
+_WRITE_FLUSH_SECONDS = 0.01
+
+
+
+@lru_cache(maxsize=256)
+def _match_condition(key: str, value: Any) -> FieldCondition:
+    """
+    Build an exact-match condition, reusing it for low-cardinality fields.
+
+    Only use this for fields with few distinct values (doc_type, status,
+    employee_name); unique values such as file hashes would just churn it.
+
+    Args:
+        key: Payload field to match
+        value: Value the field must equal
+
+    Returns:
+        Shared FieldCondition instance; callers must not mutate it
+    """
+    return FieldCondition(key=key, match=MatchValue(value=value))
+
+
+def _hash_condition(file_hash: str) -> FieldCondition:
+    """
+    Build the file_hash match condition without pydantic validation.
+
+    Args:
+        file_hash: File hash the point must carry
+
+    Returns:
+        FieldCondition matching the hash exactly
+    """
+    return FieldCondition.model_construct(
+        key="file_hash", match=MatchValue.model_construct(value=file_hash)
+    )
+
+
+def _must_filter(conditions: List[FieldCondition]) -> Filter:
+    """
+    Combine conditions that must all hold, skipping pydantic validation.
+
+    The conditions are already models built by this module, so validating
+    the wrapper again on every lookup and search is wasted work.
+
+    Args:
+        conditions: Conditions the points must satisfy
+
+    Returns:
+        Filter requiring every condition
+    """
+    return Filter.model_construct(must=conditions)
+
+
+def _is_not_found(error: Exception) -> bool:
+    """
+    Check whether a Qdrant error means the requested object does not exist.
+
+    Args:
+        error: Exception raised by a REST or gRPC client call
+
+    Returns:
+        True for an HTTP 404 or gRPC NOT_FOUND response
+    """
+    if isinstance(error, UnexpectedResponse):
+        return error.status_code == 404
+    if isinstance(error, grpc.RpcError):
+        return error.code() == grpc.StatusCode.NOT_FOUND
+    return False
+
+
+def _is_sha256_hex(file_hash: str) -> bool:
+    """
+    Check that a string has the shape of a SHA-256 hex digest.
+
+    Args:
+        file_hash: Candidate hash
+
+    Returns:
+        True if it is 64 hexadecimal characters
+    """
+    if len(file_hash) != 64:
+        return False
+    try:
+        bytes.fromhex(file_hash)
+    except ValueError:
+        return False
+    return True
+
+
+# Last formatted storage timestamp as (unix second, ISO 8601 string).
+_timestamp_cache: Tuple[int, str] = (0, "")
+
+
+def _utc_now_iso() -> str:
+    """
+    Get the current UTC time as an ISO 8601 string at one-second resolution.
+
+    The formatted string is reused for every document stored within the same
+    second.
+
+    Returns:
+        ISO 8601 timestamp with a UTC offset
+    """
+    global _timestamp_cache
+    second = int(time.time())
+    if _timestamp_cache[0] != second:
+        _timestamp_cache = (
+            second,
+            datetime.fromtimestamp(second, tz=timezone.utc).isoformat(),
+        )
+    return _timestamp_cache[1]
+
+
+# Runs of spaces/tabs, and blank-line runs, collapsed in stored policy text.
+_INLINE_SPACE_RE = re.compile(r"[ \t]+")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n+")
+
+
+def _compact_policy_text(policy_text: str) -> str:
+    """
+    Collapse layout whitespace left over from PDF extraction.
+
+    Keeps line structure (and so section numbering) intact while dropping
+    indentation, trailing spaces and repeated blank lines.
+
+    Args:
+        policy_text: Extracted policy text
+
+    Returns:
+        Policy text with redundant whitespace removed
+    """
+    lines = (
+        _INLINE_SPACE_RE.sub(" ", line).strip() for line in policy_text.splitlines()
+    )
+    return _BLANK_LINES_RE.sub("\n\n", "\n".join(lines)).strip()
+
+
+# Matches policy documents; shared by the policy search and existence check.
+_POLICY_FILTER = Filter(must=[_match_condition("doc_type", "policy")])
+
+
+@dataclass(slots=True)
+class _EmbedJob:
+    """A text waiting to be encoded by the embedding micro-batcher."""
+
+    key: bytes
+    text: str
+    future: "asyncio.Future[List[float]]"
+
+
+@dataclass(slots=True)
+class _WriteJob:
+    """A document waiting to be embedded and upserted by the batching writer."""
+
+    doc_id: str
+    text: str
+    payload: Dict[str, Any]
+    future: "asyncio.Future[str]"
+
 
 class VectorStoreService:
     """
@@ -39,106 +295,356 @@ class VectorStoreService:
     def __init__(self):
         """Initialize the vector store service."""
         self.logger = logger
-        self.client: Optional[QdrantClient] = None
+        self.client: Optional[AsyncQdrantClient] = None
+        # Documents found by check_file_exists, keyed by (file hash, doc type),
+        # as (monotonic timestamp, document). Only hits are kept, so a newly
+        # stored file is never hidden by a cached miss; the short TTL bounds how
+        # long a point deleted by another process is still reported.
+        self._exists_cache: (
+            "OrderedDict[Tuple[str, str], Tuple[float, VectorDocument]]"
+        ) = OrderedDict()
         self.embedding_model: Optional[SentenceTransformer] = None
+        # SentenceTransformer.encode is not safe to call concurrently, so all
+        # embedding work is serialized on one dedicated thread.
+        self._encode_pool: Optional[ThreadPoolExecutor] = None
+        # Resolves once the embedding model has loaded on the encode thread.
+        self._model_ready: Optional["asyncio.Future[None]"] = None
+        self._embedding_cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._embed_queue: Optional["asyncio.Queue[_EmbedJob]"] = None
+        self._embed_task: Optional[asyncio.Task] = None
+        self._write_queue: Optional["asyncio.Queue[_WriteJob]"] = None
+        # Collection metadata responses as name -> (monotonic timestamp, value).
+        self._metadata_cache: Dict[str, Tuple[float, Any]] = {}
+        self._write_task: Optional[asyncio.Task] = None
+        # Set once a policy is known to be stored, so later checks skip Qdrant.
+        self._policy_lock = asyncio.Lock()
+        self._policy_available = False
         self.collection_name = settings.COLLECTION_NAME
         self.vector_size = settings.VECTOR_SIZE
+        # Longest invoice text worth embedding, known once the model loads.
+        self._max_embedding_chars: Optional[int] = None
 
     async def initialize(self):
         """
         Initialize the Qdrant client and embedding model.
 
-        Sets up the connection to Qdrant and loads the embedding model.
-        Also creates the collection if it doesn't exist.
+        Sets up the connection to Qdrant and starts loading the embedding model
+        in the background. Also creates the collection if it doesn't exist.
         """
         try:
-            self.client = QdrantClient(
-                url=settings.QDRANT_URL, api_key=settings.QDRANT_API_KEY
+            self.client = AsyncQdrantClient(
+                url=settings.QDRANT_URL,
+                api_key=settings.QDRANT_API_KEY,
+                prefer_grpc=settings.QDRANT_PREFER_GRPC,
+                grpc_options=_GRPC_OPTIONS,
             )
 
-            self.embedding_model = SentenceTransformer(settings.EMBEDDING_MODEL)
-            self.vector_size = self.embedding_model.get_sentence_embedding_dimension()
+            self._encode_pool = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="st-encode"
+            )
+            # Vectors from a previously loaded model are not comparable.
+            self._embedding_cache.clear()
+            # Submitted before any encode call, so the single encode thread
+            # always has the model ready by the time it runs one.
+            self._model_ready = asyncio.get_running_loop().run_in_executor(
+                self._encode_pool, self._set_up_embedding_model
+            )
+            self._model_ready.add_done_callback(self._log_model_load)
 
             await self._create_collection_if_not_exists()
 
+            self._embed_queue = asyncio.Queue(maxsize=_EMBED_QUEUE_SIZE)
+            self._embed_task = asyncio.create_task(self._embed_worker())
+            self._write_queue = asyncio.Queue(maxsize=_WRITE_QUEUE_SIZE)
+            self._write_task = asyncio.create_task(self._write_worker())
+
             self.logger.info("Vector store service initialized successfully")
 
         except Exception as e:
             self.logger.error(f"Error initializing vector store: {e}", exc_info=True)
             raise
 
+    async def close(self):
+        """Close the Qdrant connection and stop the background workers."""
+        for task in (self._write_task, self._embed_task):
+            if task:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        self._write_task = None
+        self._embed_task = None
+        if self.client:
+            await self.client.close()
+            self.client = None
+        if self._encode_pool:
+            self._encode_pool.shutdown(wait=False)
+            self._encode_pool = None
+
+    def _set_up_embedding_model(self) -> None:
+        """
+        Load the embedding model and record its vector size.
+
+        With one encode thread there is never more than one forward pass in
+        flight, so EMBEDDING_NUM_THREADS sizes PyTorch's intra-op pool for it
+        alone; set it to the container's CPU limit where PyTorch would
+        otherwise size the pool from the host's cores.
+        """
+        if settings.EMBEDDING_NUM_THREADS:
+            torch.set_num_threads(settings.EMBEDDING_NUM_THREADS)
+        self.embedding_model = self._load_embedding_model()
+        self.vector_size = self.embedding_model.get_sentence_embedding_dimension()
+        max_seq_length = getattr(self.embedding_model, "max_seq_length", None)
+        if max_seq_length:
+            self._max_embedding_chars = max_seq_length * _EMBEDDING_CHARS_PER_TOKEN
+
+    def _log_model_load(self, future: "asyncio.Future[None]") -> None:
+        """Report the outcome of the background embedding model load."""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            self.logger.error(f"Error loading embedding model: {error}")
+        else:
+            self.logger.info(f"Embedding model ready: {settings.EMBEDDING_MODEL}")
+
+    async def _wait_for_model(
+        self, timeout: Optional[float] = _MODEL_READY_TIMEOUT_SECONDS
+    ) -> None:
+        """
+        Wait until the background embedding model load has finished.
+
+        Args:
+            timeout: Seconds to wait, or None to wait for as long as the load
+                takes (start-up, where a first download can take minutes)
+
+        Raises:
+            ValueError: If the model load was never started
+            asyncio.TimeoutError: If the model is not ready in time
+            Exception: Whatever error made the model load fail
+        """
+        if self._model_ready is None:
+            raise ValueError("Embedding model not initialized")
+        await asyncio.wait_for(asyncio.shield(self._model_ready), timeout=timeout)
+
+    def _load_embedding_model(self) -> SentenceTransformer:
+        """
+        Load the embedding model at reduced precision where it is safe.
+
+        On CUDA the model runs in FP16. On CPU it runs on EMBEDDING_BACKEND
+        when that is ONNX Runtime or OpenVINO; otherwise, or if that backend
+        cannot load, Linear layers are dynamically quantized to int8 when
+        EMBEDDING_CPU_INT8 is enabled.
+
+        Returns:
+            Loaded SentenceTransformer model
+        """
+        if torch.cuda.is_available():
+            model = SentenceTransformer(settings.EMBEDDING_MODEL, device="cuda")
+            model.half()
+            self.logger.info("Loaded embedding model on CUDA in FP16")
+            return model
+
+        if settings.EMBEDDING_BACKEND != EmbeddingBackend.TORCH:
+            model = self._load_exported_embedding_model()
+            if model is not None:
+                return model
+
+        model = SentenceTransformer(settings.EMBEDDING_MODEL, device="cpu")
+        if settings.EMBEDDING_CPU_INT8:
+            model = torch.ao.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+            self.logger.info("Loaded embedding model on CPU with int8 Linear layers")
+        return model
+
+    def _load_exported_embedding_model(self) -> Optional[SentenceTransformer]:
+        """
+        Load the embedding model on the ONNX Runtime or OpenVINO backend.
+
+        The model is exported on first use unless EMBEDDING_ONNX_FILE names a
+        file (such as a pre-quantized int8 export) in the model repository.
+        Output matches the PyTorch model, including pooling and normalization.
+
+        Returns:
+            Loaded model, or None if the backend is unavailable
+        """
+        backend = settings.EMBEDDING_BACKEND.value
+        model_kwargs = {}
+        if settings.EMBEDDING_ONNX_FILE:
+            model_kwargs["file_name"] = settings.EMBEDDING_ONNX_FILE
+        try:
+            model = SentenceTransformer(
+                settings.EMBEDDING_MODEL,
+                device="cpu",
+                backend=backend,
+                model_kwargs=model_kwargs or None,
+            )
+        except Exception as e:
+            self.logger.warning(
+                f"Could not load embedding model with {backend} backend, "
+                f"falling back to PyTorch: {e}"
+            )
+            return None
+        self.logger.info(f"Loaded embedding model on CPU with {backend} backend")
+        return model
+
     async def _create_collection_if_not_exists(self):
         """Create the collection if it doesn't already exist."""
         if not self.client:
             raise ValueError("Qdrant client not initialized")
 
         try:
-            self.client.get_collection(self.collection_name)
+            info = await self.client.get_collection(self.collection_name)
+        except Exception as e:
+            # Only a missing collection is created; auth errors, timeouts and
+            # an unreachable server must not turn into a create attempt.
+            if not _is_not_found(e):
+                raise
+            info = None
+        if info is not None:
             self.logger.info(f"Collection already exists: {self.collection_name}")
-            await self._create_payload_indexes()
+            if info.config.quantization_config is None:
+                await self._enable_quantization()
+            await self._create_payload_indexes(info.payload_schema)
             return
-        except Exception:
-            pass
 
+        # Start-up cannot continue without the vector size, and a fresh
+        # deployment may still be downloading the model, so wait without limit.
+        await self._wait_for_model(timeout=None)
         if self.vector_size is None:
             raise ValueError(
                 "Vector size not initialized. Ensure embedding model is loaded first."
             )
 
-        self.client.create_collection(
+        # Hits remembered for a previous incarnation of the collection are gone.
+        self._exists_cache.clear()
+        await self.client.create_collection(
             collection_name=self.collection_name,
             vectors_config=VectorParams(
                 size=self.vector_size, distance=Distance.COSINE
             ),
+            # Invoice text and analysis make payloads large; filters only read
+            # the payload indexes, which stay in RAM.
+            on_disk_payload=True,
+            quantization_config=_QUANTIZATION_CONFIG,
+            hnsw_config=HnswConfigDiff(
+                m=32,
+                payload_m=16,
+                ef_construct=128,
+                full_scan_threshold=10000,
+                on_disk=False,
+            ),
         )
+        self._metadata_cache.clear()
         self.logger.info(f"Created collection: {self.collection_name}")
         await self._create_payload_indexes()
 
-    async def _create_payload_indexes(self):
-        """Create payload indexes for efficient filtering."""
+    async def _enable_quantization(self):
+        """
+        Add int8 scalar quantization to a collection created without it.
+
+        Qdrant builds the quantized vectors in the background; searches keep
+        working on the original vectors until it finishes.
+        """
+        try:
+            await self.client.update_collection(
+                collection_name=self.collection_name,
+                quantization_config=_QUANTIZATION_CONFIG,
+            )
+            self._metadata_cache.clear()
+            self.logger.info(
+                f"Enabled scalar quantization on collection: {self.collection_name}"
+            )
+        except Exception as e:
+            self.logger.warning(f"Could not enable scalar quantization: {e}")
+
+    async def _create_payload_indexes(self, existing: Optional[Dict[str, Any]] = None):
+        """
+        Create payload indexes for efficient filtering.
+
+        All missing indexes are requested concurrently, so a cold start pays
+        roughly one round trip. Fields already indexed are skipped unless the
+        index was built with different parameters.
+
+        Args:
+            existing: The collection's payload schema, field name -> index info
+        """
         if not self.client:
             raise ValueError("Qdrant client not initialized")
 
         try:
-            from qdrant_client.http.models import PayloadSchemaType
+            from qdrant_client.http.models import (
+                KeywordIndexParams,
+                KeywordIndexType,
+                PayloadSchemaType,
+            )
 
             indexes_to_create = [
                 ("status", PayloadSchemaType.KEYWORD),
-                ("employee_name", PayloadSchemaType.KEYWORD),
+                # Tenant index: keeps each employee's points together on disk
+                (
+                    "employee_name",
+                    KeywordIndexParams(
+                        type=KeywordIndexType.KEYWORD, is_tenant=True, on_disk=False
+                    ),
+                ),
                 ("doc_type", PayloadSchemaType.KEYWORD),
                 ("currency", PayloadSchemaType.KEYWORD),
-                ("file_hash", PayloadSchemaType.KEYWORD),  # Add file hash index
+                # SHA-256 hex digests, not UUIDs, so a RAM-resident keyword index
+                (
+                    "file_hash",
+                    KeywordIndexParams(
+                        type=KeywordIndexType.KEYWORD, is_tenant=False, on_disk=False
+                    ),
+                ),
                 ("total_amount", PayloadSchemaType.FLOAT),
                 ("reimbursement_amount", PayloadSchemaType.FLOAT),
+                ("date", PayloadSchemaType.DATETIME),
             ]
+            if existing:
+                indexes_to_create = [
+                    (field_name, field_schema)
+                    for field_name, field_schema in indexes_to_create
+                    if field_name not in existing
+                    or (
+                        isinstance(field_schema, KeywordIndexParams)
+                        and existing[field_name].params != field_schema
+                    )
+                ]
+                if not indexes_to_create:
+                    self.logger.debug("All payload indexes already exist")
+                    return
 
-            for field_name, field_schema in indexes_to_create:
-                try:
+            results = await asyncio.gather(
+                *(
                     self.client.create_payload_index(
                         collection_name=self.collection_name,
                         field_name=field_name,
                         field_schema=field_schema,
                     )
+                    for field_name, field_schema in indexes_to_create
+                ),
+                return_exceptions=True,
+            )
+
+            for (field_name, _), result in zip(indexes_to_create, results):
+                if not isinstance(result, Exception):
                     self.logger.info(f"Created index for field: {field_name}")
-                except Exception as e:
-                    if (
-                        "already exists" in str(e).lower()
-                        or "already indexed" in str(e).lower()
-                    ):
-                        self.logger.debug(
-                            f"Index already exists for field: {field_name}"
-                        )
-                    else:
-                        self.logger.warning(
-                            f"Failed to create index for {field_name}: {e}"
-                        )
+                elif (
+                    "already exists" in str(result).lower()
+                    or "already indexed" in str(result).lower()
+                ):
+                    self.logger.debug(f"Index already exists for field: {field_name}")
+                else:
+                    self.logger.warning(
+                        f"Failed to create index for {field_name}: {result}"
+                    )
 
             self.logger.info("Payload indexes creation completed")
 
         except Exception as e:
             self.logger.error(f"Error creating payload indexes: {e}")
 
-    def _generate_embedding(self, text: str) -> List[float]:
+    def _generate_embedding(self, text: str) -> np.ndarray:
         """
         Generate embedding for the given text.
 
@@ -146,24 +652,171 @@ class VectorStoreService:
             text: Text to generate embedding for
 
         Returns:
-            List of floats representing the embedding
+            float32 array holding the embedding
         """
         if not self.embedding_model:
             raise ValueError("Embedding model not initialized")
 
         try:
-            embedding = self.embedding_model.encode(text)
-            # Convert numpy array or tensor to list of floats
-            if hasattr(embedding, "tolist"):
-                return embedding.tolist()
-            elif isinstance(embedding, (list, tuple)):
-                return [float(x) for x in embedding]
-            else:
-                return [float(x) for x in embedding]
+            embedding = self.embedding_model.encode(
+                text, convert_to_numpy=True, normalize_embeddings=True
+            )
+            return embedding.astype(np.float32, copy=False)
         except Exception as e:
             self.logger.error(f"Error generating embedding: {e}")
             raise
 
+    def _generate_embeddings_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Generate embeddings for several texts in a single encode call.
+
+        Args:
+            texts: Texts to generate embeddings for
+
+        Returns:
+            float32 array with one embedding row per input text, in order
+        """
+        if not self.embedding_model:
+            raise ValueError("Embedding model not initialized")
+
+        try:
+            embeddings = self.embedding_model.encode(
+                texts,
+                batch_size=_EMBEDDING_BATCH_SIZE,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+            )
+            return embeddings.astype(np.float32, copy=False)
+        except Exception as e:
+            self.logger.error(f"Error generating embeddings: {e}")
+            raise
+
+    @staticmethod
+    def _embedding_key(text: str) -> bytes:
+        """Hash a text into the key used by the embedding cache."""
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    def _cache_embedding(self, key: bytes, embedding: np.ndarray) -> None:
+        """
+        Remember an embedding, evicting the least recently used one when full.
+
+        Embeddings stay float32 arrays as the model produced them and become
+        lists only when handed to Qdrant. Rows of a batch are copied so a
+        cached row does not keep the whole batch array alive.
+
+        Args:
+            key: Cache key from _embedding_key
+            embedding: Embedding to store
+        """
+        if embedding.base is not None:
+            embedding = embedding.copy()
+        self._embedding_cache[key] = embedding
+        self._embedding_cache.move_to_end(key)
+        if len(self._embedding_cache) > _EMBEDDING_CACHE_SIZE:
+            self._embedding_cache.popitem(last=False)
+
+    async def _embed(self, text: str) -> List[float]:
+        """
+        Get the embedding for a text, using the cache before the model.
+
+        Args:
+            text: Text to generate embedding for
+
+        Returns:
+            List of floats representing the embedding
+        """
+        key = self._embedding_key(text)
+        cached = self._embedding_cache.get(key)
+        if cached is not None:
+            self._embedding_cache.move_to_end(key)
+            return cached.tolist()
+
+        await self._wait_for_model()
+        if self._embed_queue is None:
+            embedding = await asyncio.get_running_loop().run_in_executor(
+                self._encode_pool, self._generate_embedding, text
+            )
+            self._cache_embedding(key, embedding)
+            return embedding.tolist()
+
+        future: "asyncio.Future[List[float]]" = (
+            asyncio.get_running_loop().create_future()
+        )
+        await self._embed_queue.put(_EmbedJob(key, text, future))
+        return await future
+
+    async def _embed_worker(self):
+        """
+        Encode queued single-text embedding requests in shared batches.
+
+        Takes one request, then everything already queued behind it, so
+        requests that arrive while a batch is encoding share the next encode
+        call without adding latency when the service is idle. Identical texts
+        in a batch are encoded once.
+        """
+        while True:
+            jobs = [await self._embed_queue.get()]
+            while len(jobs) < _EMBEDDING_BATCH_SIZE and not self._embed_queue.empty():
+                jobs.append(self._embed_queue.get_nowait())
+
+            texts: Dict[bytes, str] = {}
+            for job in jobs:
+                texts.setdefault(job.key, job.text)
+
+            try:
+                encoded = await asyncio.get_running_loop().run_in_executor(
+                    self._encode_pool,
+                    self._generate_embeddings_batch,
+                    list(texts.values()),
+                )
+            except Exception as e:
+                for job in jobs:
+                    if not job.future.done():
+                        job.future.set_exception(e)
+                continue
+
+            embeddings = dict(zip(texts, encoded))
+            for key, embedding in embeddings.items():
+                self._cache_embedding(key, embedding)
+            for job in jobs:
+                if not job.future.done():
+                    job.future.set_result(embeddings[job.key].tolist())
+
+    async def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Get embeddings for several texts, encoding only the cache misses.
+
+        Args:
+            texts: Texts to generate embeddings for
+
+        Returns:
+            Embeddings in the same order as the input texts
+        """
+        keys = [self._embedding_key(text) for text in texts]
+        embeddings: List[Optional[List[float]]] = [None] * len(texts)
+        misses: List[int] = []
+
+        for index, key in enumerate(keys):
+            cached = self._embedding_cache.get(key)
+            if cached is None:
+                misses.append(index)
+            else:
+                self._embedding_cache.move_to_end(key)
+                embeddings[index] = cached.tolist()
+
+        if misses:
+            await self._wait_for_model()
+            encoded = await asyncio.get_running_loop().run_in_executor(
+                self._encode_pool,
+                self._generate_embeddings_batch,
+                [texts[index] for index in misses],
+            )
+            for index, embedding in zip(misses, encoded):
+                embeddings[index] = embedding.tolist()
+                self._cache_embedding(keys[index], embedding)
+
+        return embeddings
+
     async def check_file_exists(
         self, file_hash: str, doc_type: str = "invoice_analysis"
     ) -> Optional[VectorDocument]:
@@ -181,18 +834,23 @@ class VectorStoreService:
             if not self.client:
                 raise ValueError("Qdrant client not initialized")
 
-            filter_conditions = Filter(
-                must=[
-                    FieldCondition(key="file_hash", match=MatchValue(value=file_hash)),
-                    FieldCondition(key="doc_type", match=MatchValue(value=doc_type)),
-                ]
+            cache_key = (file_hash, doc_type)
+            cached = self._exists_cache.get(cache_key)
+            if cached is not None:
+                if time.monotonic() - cached[0] < _EXISTS_TTL_SECONDS:
+                    self._exists_cache.move_to_end(cache_key)
+                    return cached[1]
+                del self._exists_cache[cache_key]
+
+            filter_conditions = _must_filter(
+                [_hash_condition(file_hash), _match_condition("doc_type", doc_type)]
             )
 
-            search_results = self.client.scroll(
+            search_results = await self.client.scroll(
                 collection_name=self.collection_name,
                 scroll_filter=filter_conditions,
                 limit=1,
-                with_payload=True,
+                with_payload=self._existence_payload(doc_type),
                 with_vectors=False,
             )
 
@@ -200,12 +858,16 @@ class VectorStoreService:
                 point = search_results[0][0]
                 payload = point.payload or {}
 
-                return VectorDocument(
+                document = VectorDocument(
                     id=str(point.id),
                     content=payload.get("content", ""),
                     embedding=[],
                     metadata=payload,
                 )
+                self._exists_cache[cache_key] = (time.monotonic(), document)
+                if len(self._exists_cache) > _EXISTS_CACHE_SIZE:
+                    self._exists_cache.popitem(last=False)
+                return document
 
             return None
 
@@ -215,6 +877,131 @@ class VectorStoreService:
             )
             return None
 
+    @staticmethod
+    def _existence_payload(doc_type: str) -> PayloadSelectorInclude:
+        """
+        Select the payload fields a duplicate check needs for a document type.
+
+        Args:
+            doc_type: Type of document being checked
+
+        Returns:
+            Payload selector for the fields callers read from a cached match
+        """
+        return PayloadSelectorInclude(
+            include=_EXISTENCE_FIELDS.get(doc_type, ["content"])
+        )
+
+    async def _has_matches(
+        self, filter_conditions: Filter, exact: bool = True
+    ) -> bool:
+        """
+        Check whether any point matches a filter without fetching payloads.
+
+        Approximate counts are only reliable for a single indexed condition;
+        Qdrant estimates combined conditions and may round a lone match to 0.
+
+        Args:
+            filter_conditions: Filter the points must satisfy
+            exact: Whether Qdrant must count exactly instead of estimating
+
+        Returns:
+            True if at least one point matches
+        """
+        result = await self.client.count(
+            collection_name=self.collection_name,
+            count_filter=filter_conditions,
+            exact=exact,
+        )
+        return result.count > 0
+
+    async def check_files_exist(
+        self,
+        pairs: List[Tuple[str, str]],
+        employee_name: Optional[str] = None,
+    ) -> Dict[str, Optional[VectorDocument]]:
+        """
+        Check several file hashes for existing documents in one round trip.
+
+        Args:
+            pairs: (file_hash, doc_type) tuples to look up
+            employee_name: Optional employee name every match must belong to
+
+        Returns:
+            Dictionary mapping each file hash to its VectorDocument, or None
+            if no matching document exists
+        """
+        found: Dict[str, Optional[VectorDocument]] = {
+            file_hash: None for file_hash, _ in pairs
+        }
+        if not pairs:
+            return found
+
+        try:
+            if not self.client:
+                raise ValueError("Qdrant client not initialized")
+
+            requests = []
+            for file_hash, doc_type in pairs:
+                conditions = [
+                    _hash_condition(file_hash),
+                    _match_condition("doc_type", doc_type),
+                ]
+                if employee_name is not None:
+                    conditions.append(_match_condition("employee_name", employee_name))
+                requests.append(
+                    QueryRequest(
+                        filter=_must_filter(conditions),
+                        limit=1,
+                        with_payload=self._existence_payload(doc_type),
+                        with_vector=False,
+                    )
+                )
+
+            responses = await self.client.query_batch_points(
+                collection_name=self.collection_name, requests=requests
+            )
+
+            for (file_hash, _), response in zip(pairs, responses):
+                if response.points:
+                    point = response.points[0]
+                    payload = point.payload or {}
+                    found[file_hash] = VectorDocument(
+                        id=str(point.id),
+                        content=payload.get("content", ""),
+                        embedding=[],
+                        metadata=payload,
+                    )
+
+            return found
+
+        except Exception as e:
+            self.logger.error(f"Error checking existence of {len(pairs)} files: {e}")
+            return found
+
+    @staticmethod
+    def _invoice_point_id(employee_name: str, file_hash: Optional[str]) -> str:
+        """
+        Derive the point ID for an employee's invoice analysis.
+
+        IDs are deterministic when the file hash is known, so an invoice can be
+        looked up by primary key and re-storing it overwrites the same point.
+
+        Args:
+            employee_name: Name of the employee
+            file_hash: SHA-256 hash of the invoice file content, if known
+
+        Returns:
+            Point ID as a UUID string
+        """
+        if file_hash is None:
+            return str(uuid.uuid4())
+        return str(
+            uuid.uuid5(
+                _INVOICE_NAMESPACE, f"invoice_analysis:{employee_name}:{file_hash}"
+            )
+        )
+
     async def check_invoice_exists(
         self, invoice_hash: str, employee_name: str
     ) -> Optional[VectorDocument]:
@@ -232,30 +1019,15 @@ class VectorStoreService:
             if not self.client:
                 raise ValueError("Qdrant client not initialized")
 
-            filter_conditions = Filter(
-                must=[
-                    FieldCondition(
-                        key="file_hash", match=MatchValue(value=invoice_hash)
-                    ),
-                    FieldCondition(
-                        key="doc_type", match=MatchValue(value="invoice_analysis")
-                    ),
-                    FieldCondition(
-                        key="employee_name", match=MatchValue(value=employee_name)
-                    ),
-                ]
-            )
-
-            search_results = self.client.scroll(
+            points = await self.client.retrieve(
                 collection_name=self.collection_name,
-                scroll_filter=filter_conditions,
-                limit=1,
-                with_payload=True,
+                ids=[self._invoice_point_id(employee_name, invoice_hash)],
+                with_payload=self._existence_payload("invoice_analysis"),
                 with_vectors=False,
             )
 
-            if search_results[0]:
-                point = search_results[0][0]
+            if points:
+                point = points[0]
                 payload = point.payload or {}
 
                 return VectorDocument(
@@ -265,7 +1037,12 @@ class VectorStoreService:
                     metadata=payload,
                 )
 
-            return None
+            # Analyses stored before point IDs were derived from the hash have
+            # random IDs, so fall back to the payload filter the batch check uses.
+            found = await self.check_files_exist(
+                [(invoice_hash, "invoice_analysis")], employee_name=employee_name
+            )
+            return found[invoice_hash]
 
         except Exception as e:
             self.logger.error(
@@ -273,6 +1050,71 @@ class VectorStoreService:
             )
             return None
 
+    async def _write(self, doc_id: str, text: str, payload: Dict[str, Any]) -> str:
+        """
+        Queue a document for the batching writer and wait until it is stored.
+
+        Args:
+            doc_id: ID of the point to write
+            text: Text to embed as the point's vector
+            payload: Payload stored with the point
+
+        Returns:
+            Document ID of the stored record
+
+        Raises:
+            ValueError: If the vector store is not initialized
+        """
+        if not self.client or not self._write_queue:
+            raise ValueError("Qdrant client not initialized")
+
+        future: "asyncio.Future[str]" = asyncio.get_running_loop().create_future()
+        await self._write_queue.put(_WriteJob(doc_id, text, payload, future))
+        return await future
+
+    async def _write_worker(self):
+        """
+        Embed and upsert queued documents in micro-batches.
+
+        Waits for one document, then collects whatever else arrives within
+        the flush window so concurrent writers share one encode call and one
+        upsert. Each job's future receives its document ID or the error.
+        """
+        while True:
+            jobs = [await self._write_queue.get()]
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + _WRITE_FLUSH_SECONDS
+            while len(jobs) < _WRITE_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    jobs.append(
+                        await asyncio.wait_for(self._write_queue.get(), timeout)
+                    )
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                embeddings = await self._embed_batch([job.text for job in jobs])
+                await self.client.upsert(
+                    collection_name=self.collection_name,
+                    points=Batch(
+                        ids=[job.doc_id for job in jobs],
+                        vectors=embeddings,
+                        payloads=[job.payload for job in jobs],
+                    ),
+                )
+            except Exception as e:
+                for job in jobs:
+                    if not job.future.done():
+                        job.future.set_exception(e)
+            else:
+                for job in jobs:
+                    if not job.future.done():
+                        job.future.set_result(job.doc_id)
+                self.logger.debug("Wrote batch of %d documents", len(jobs))
+
     async def store_invoice_analysis(
         self,
         invoice_text: str,
@@ -295,65 +1137,104 @@ class VectorStoreService:
             Document ID of the stored record
         """
         try:
-            doc_id = str(uuid.uuid4())
-
-            content_for_embedding = f"""
-            Invoice: {invoice_text}
-            
-            Analysis:
-            Status: {analysis_result.get("status", "")}
-            Reason: {analysis_result.get("reason", "")}
-            Categories: {", ".join(analysis_result.get("categories", []))}
-            """
-
-            embedding = await asyncio.get_event_loop().run_in_executor(
-                None, self._generate_embedding, content_for_embedding
-            )
-
-            status_value = analysis_result.get("status", "")
-            if hasattr(status_value, "value"):
-                status_value = status_value.value
-            elif str(status_value).startswith("ReimbursementStatus."):
-                status_value = str(status_value).split(".")[-1].lower()
-
-            metadata = {
-                "employee_name": employee_name,
-                "invoice_filename": invoice_filename,
-                "status": status_value,
-                "reason": analysis_result.get("reason", ""),
-                "total_amount": analysis_result.get("total_amount", 0.0),
-                "reimbursement_amount": analysis_result.get(
-                    "reimbursement_amount", 0.0
+            doc_id = await self._write(
+                self._invoice_point_id(employee_name, file_hash),
+                self._build_invoice_embedding_content(invoice_text, analysis_result),
+                self._build_invoice_payload(
+                    invoice_text,
+                    analysis_result,
+                    employee_name,
+                    invoice_filename,
+                    file_hash,
                 ),
-                "currency": analysis_result.get("currency", "USD"),
-                "categories": analysis_result.get("categories", []),
-                "policy_violations": analysis_result.get("policy_violations", []),
-                "date": datetime.now(timezone.utc).isoformat(),
-                "doc_type": "invoice_analysis",
-                "file_hash": file_hash,
-            }
-
-            point = PointStruct(
-                id=doc_id,
-                vector=embedding,
-                payload={
-                    "content": invoice_text,
-                    "analysis": analysis_result,
-                    **metadata,
-                },
             )
 
-            if not self.client:
-                raise ValueError("Qdrant client not initialized")
-            self.client.upsert(collection_name=self.collection_name, points=[point])
-
-            self.logger.info(f"Stored invoice analysis for {employee_name}: {doc_id}")
+            self.logger.info(
+                "Stored invoice analysis for %s: %s", employee_name, doc_id
+            )
             return doc_id
 
         except Exception as e:
             self.logger.error(f"Error storing invoice analysis: {e}", exc_info=True)
             raise
 
+    def _build_invoice_embedding_content(
+        self, invoice_text: str, analysis_result: Dict[str, Any]
+    ) -> str:
+        """
+        Build the text embedded for an invoice analysis.
+
+        The short analysis summary comes first so the model's token window
+        never truncates it, and the invoice text is cut at roughly where the
+        window ends so the tokenizer does not process text the model drops.
+
+        Args:
+            invoice_text: Original invoice text
+            analysis_result: LLM analysis result
+
+        Returns:
+            Key analysis fields followed by the (truncated) invoice text
+        """
+        return "\n".join(
+            (
+                "Analysis:",
+                f"Status: {analysis_result.get('status', '')}",
+                f"Reason: {analysis_result.get('reason', '')}",
+                f"Categories: {', '.join(analysis_result.get('categories', []))}",
+                "",
+                f"Invoice: {invoice_text[: self._max_embedding_chars]}",
+            )
+        )
+
+    @staticmethod
+    def _build_invoice_payload(
+        invoice_text: str,
+        analysis_result: Dict[str, Any],
+        employee_name: str,
+        invoice_filename: str,
+        file_hash: Optional[str],
+    ) -> Dict[str, Any]:
+        """
+        Build the Qdrant payload stored with an invoice analysis.
+
+        Args:
+            invoice_text: Original invoice text
+            analysis_result: LLM analysis result
+            employee_name: Name of the employee
+            invoice_filename: Original filename of the invoice
+            file_hash: Optional SHA-256 hash of the file content
+
+        Returns:
+            Payload dictionary
+        """
+        status_value = analysis_result.get("status", "")
+        if hasattr(status_value, "value"):
+            status_value = status_value.value
+        elif str(status_value).startswith("ReimbursementStatus."):
+            status_value = str(status_value).split(".")[-1].lower()
+
+        metadata = {
+            "employee_name": employee_name,
+            "invoice_filename": invoice_filename,
+            "status": status_value,
+            "reason": analysis_result.get("reason", ""),
+            "total_amount": analysis_result.get("total_amount", 0.0),
+            "reimbursement_amount": analysis_result.get("reimbursement_amount", 0.0),
+            "currency": analysis_result.get("currency", "USD"),
+            "categories": analysis_result.get("categories", []),
+            "policy_violations": analysis_result.get("policy_violations", []),
+            "date": _utc_now_iso(),
+            "doc_type": "invoice_analysis",
+            "file_hash": file_hash,
+        }
+
+        # The analysis fields live at the top level only; a nested copy of
+        # analysis_result would duplicate every one of them.
+        return {
+            "content": invoice_text,
+            **metadata,
+        }
+
     async def search_similar_invoices(
         self,
         query_text: str,
@@ -374,9 +1255,7 @@ class VectorStoreService:
             List of search results with documents and scores
         """
         try:
-            query_embedding = await asyncio.get_event_loop().run_in_executor(
-                None, self._generate_embedding, query_text
-            )
+            query_embedding = await self._embed(query_text)
 
             filter_conditions = None
             if filters:
@@ -385,35 +1264,53 @@ class VectorStoreService:
             if not self.client:
                 raise ValueError("Qdrant client not initialized")
 
-            search_results = self.client.query_points(
+            search_results = await self.client.query_points(
                 collection_name=self.collection_name,
                 query=query_embedding,
                 query_filter=filter_conditions,
                 limit=limit,
                 score_threshold=score_threshold,
+                search_params=_SEARCH_PARAMS,
                 with_payload=True,
             )
 
-            results = []
-            for result in search_results.points:
-                payload = result.payload or {}
-                doc = VectorDocument(
-                    id=str(result.id),
-                    content=payload.get("content", ""),
-                    embedding=query_embedding,
-                    metadata=payload,
-                )
-
-                search_result = SearchResult(document=doc, score=result.score)
-                results.append(search_result)
+            results = self._to_search_results(search_results.points)
 
-            self.logger.info(f"Found {len(results)} similar invoices for query")
+            self.logger.info("Found %d similar invoices for query", len(results))
             return results
 
         except Exception as e:
             self.logger.error(f"Error searching similar invoices: {e}", exc_info=True)
             return []
 
+    @staticmethod
+    def _to_search_results(points: List[Any]) -> List[SearchResult]:
+        """
+        Wrap scored Qdrant points as search results.
+
+        The models are built without validation: the payloads were written by
+        this service, and chatbot summaries fetch up to 1000 hits at a time.
+        Result documents carry no embedding; callers already have the query.
+
+        Args:
+            points: Scored points returned by query_points
+
+        Returns:
+            Search results in the order Qdrant ranked them
+        """
+        return [
+            SearchResult.model_construct(
+                document=VectorDocument.model_construct(
+                    id=str(point.id),
+                    content=(point.payload or {}).get("content", ""),
+                    embedding=[],
+                    metadata=point.payload or {},
+                ),
+                score=point.score,
+            )
+            for point in points
+        ]
+
     def _build_filter_conditions(self, filters: Dict[str, Any]) -> Optional[Filter]:
         """
         Build Qdrant filter conditions from filter dictionary.
@@ -428,18 +1325,13 @@ class VectorStoreService:
 
         if "employee_name" in filters and filters["employee_name"]:
             conditions.append(
-                FieldCondition(
-                    key="employee_name",
-                    match=MatchValue(value=filters["employee_name"]),
-                )
+                _match_condition("employee_name", filters["employee_name"])
             )
 
         if "status" in filters and filters["status"]:
-            conditions.append(
-                FieldCondition(key="status", match=MatchValue(value=filters["status"]))
-            )
+            conditions.append(_match_condition("status", filters["status"]))
 
-        return Filter(must=conditions) if conditions else None
+        return _must_filter(conditions) if conditions else None
 
     async def get_document_by_id(self, doc_id: str) -> Optional[VectorDocument]:
         """
@@ -455,7 +1347,7 @@ class VectorStoreService:
             if not self.client:
                 raise ValueError("Qdrant client not initialized")
 
-            result = self.client.retrieve(
+            result = await self.client.retrieve(
                 collection_name=self.collection_name,
                 ids=[doc_id],
                 with_payload=True,
@@ -470,7 +1362,7 @@ class VectorStoreService:
                 embedding: List[float] = []
                 if vector:
                     if isinstance(vector, dict):
-                        first_vector = list(vector.values())[0] if vector else []
+                        first_vector = next(iter(vector.values()), [])
                         embedding = self._flatten_to_float_list(first_vector)
                     elif isinstance(vector, list):
                         embedding = self._flatten_to_float_list(vector)
@@ -504,9 +1396,13 @@ class VectorStoreService:
             if not self.client:
                 raise ValueError("Qdrant client not initialized")
 
-            self.client.delete(
+            await self.client.delete(
                 collection_name=self.collection_name, points_selector=[doc_id]
             )
+            # The deleted point may be a remembered duplicate-check hit or the
+            # last stored policy
+            self._exists_cache.clear()
+            self._policy_available = False
 
             self.logger.info(f"Deleted document: {doc_id}")
             return True
@@ -515,6 +1411,46 @@ class VectorStoreService:
             self.logger.error(f"Error deleting document {doc_id}: {e}")
             return False
 
+    async def _cached_metadata(
+        self, key: str, fetch: Callable[[], Awaitable[Any]], force: bool = False
+    ) -> Any:
+        """
+        Return a collection metadata response, reusing it for a few seconds.
+
+        Args:
+            key: Cache key for the response
+            fetch: Zero-argument coroutine function that queries Qdrant
+            force: Whether to bypass the cache and query Qdrant
+
+        Returns:
+            The cached or freshly fetched response
+        """
+        cached = self._metadata_cache.get(key)
+        if (
+            not force
+            and cached is not None
+            and time.monotonic() - cached[0] < _METADATA_TTL_SECONDS
+        ):
+            return cached[1]
+
+        value = await fetch()
+        self._metadata_cache[key] = (time.monotonic(), value)
+        return value
+
+    async def _get_collection_cached(self, force: bool = False) -> Any:
+        """Get this service's collection info through the metadata cache."""
+        return await self._cached_metadata(
+            f"collection:{self.collection_name}",
+            lambda: self.client.get_collection(self.collection_name),
+            force,
+        )
+
+    async def _list_collections_cached(self, force: bool = False) -> Any:
+        """List the Qdrant collections through the metadata cache."""
+        return await self._cached_metadata(
+            "collections", self.client.get_collections, force
+        )
+
     async def get_collection_stats(self) -> Dict[str, Any]:
         """
         Get statistics about the collection.
@@ -526,7 +1462,7 @@ class VectorStoreService:
             if not self.client:
                 raise ValueError("Qdrant client not initialized")
 
-            info = self.client.get_collection(self.collection_name)
+            info = await self._get_collection_cached()
 
             return {
                 "collection_name": self.collection_name,
@@ -540,10 +1476,13 @@ class VectorStoreService:
             self.logger.error(f"Error getting collection stats: {e}")
             return {}
 
-    async def health_check(self) -> Dict[str, Any]:
+    async def health_check(self, force: bool = False) -> Dict[str, Any]:
         """
         Perform health check on the vector store.
 
+        Args:
+            force: Whether to query Qdrant even if recent metadata is cached
+
         Returns:
             Dictionary with health status information
 
@@ -554,9 +1493,10 @@ class VectorStoreService:
             raise Exception("Vector store client not initialized")
 
         try:
-            collections = self.client.get_collections()
-
-            collection_info = self.client.get_collection(self.collection_name)
+            collections, collection_info = await asyncio.gather(
+                self._list_collections_cached(force),
+                self._get_collection_cached(force),
+            )
 
             return {
                 "status": "healthy",
@@ -581,7 +1521,7 @@ class VectorStoreService:
             raise Exception("Vector store client not initialized")
 
         try:
-            collection_info = self.client.get_collection(self.collection_name)
+            collection_info = await self._get_collection_cached()
             return {
                 "name": self.collection_name,
                 "points_count": collection_info.points_count if collection_info else 0,
@@ -602,6 +1542,12 @@ class VectorStoreService:
         Returns:
             List of float values
         """
+        try:
+            return np.asarray(data, dtype=np.float64).ravel().tolist()
+        except (ValueError, TypeError):
+            # Ragged or partly non-numeric input: skip what does not convert
+            pass
+
         result = []
         if isinstance(data, list):
             for item in data:
@@ -636,44 +1582,75 @@ class VectorStoreService:
             file_hash: Optional SHA-256 hash of the file content
 
         Returns:
-            Document ID of the stored policy
+            Document ID of the stored policy, or of the existing one when the
+            same file is already embedded with the current embedding model
         """
         try:
-            doc_id = str(uuid.uuid4())
-
-            embedding = await asyncio.get_event_loop().run_in_executor(
-                None, self._generate_embedding, policy_text
-            )
+            if file_hash:
+                existing = await self.check_policy_exists(file_hash)
+                if (
+                    existing
+                    and existing.metadata.get("embedding_model")
+                    == settings.EMBEDDING_MODEL
+                ):
+                    self.logger.info(
+                        "Policy %s already embedded with %s, reusing %s",
+                        policy_name,
+                        settings.EMBEDDING_MODEL,
+                        existing.id,
+                    )
+                    return existing.id
 
-            metadata = {
-                "doc_type": "policy",
-                "policy_name": policy_name,
-                "organization": organization,
-                "date": datetime.now(timezone.utc).isoformat(),
-                "content_type": "hr_reimbursement_policy",
-                "file_hash": file_hash,
-            }
+            policy_text = await asyncio.to_thread(_compact_policy_text, policy_text)
 
-            point = PointStruct(
-                id=doc_id,
-                vector=embedding,
-                payload={
-                    "content": policy_text,
-                    **metadata,
-                },
+            doc_id = await self._write(
+                str(uuid.uuid4()),
+                policy_text,
+                self._build_policy_payload(
+                    policy_text, policy_name, organization, file_hash
+                ),
             )
+            self._policy_available = True
 
-            if not self.client:
-                raise ValueError("Qdrant client not initialized")
-            self.client.upsert(collection_name=self.collection_name, points=[point])
-
-            self.logger.info(f"Stored policy document: {policy_name} with ID: {doc_id}")
+            self.logger.info(
+                "Stored policy document: %s with ID: %s", policy_name, doc_id
+            )
             return doc_id
 
         except Exception as e:
             self.logger.error(f"Error storing policy document: {e}", exc_info=True)
             raise
 
+    @staticmethod
+    def _build_policy_payload(
+        policy_text: str,
+        policy_name: str,
+        organization: str,
+        file_hash: Optional[str],
+    ) -> Dict[str, Any]:
+        """
+        Build the Qdrant payload stored with a policy document.
+
+        Args:
+            policy_text: Policy text, already compacted
+            policy_name: Name/identifier for the policy
+            organization: Organization name
+            file_hash: Optional SHA-256 hash of the file content
+
+        Returns:
+            Payload dictionary
+        """
+        return {
+            "content": policy_text,
+            "doc_type": "policy",
+            "policy_name": policy_name,
+            "organization": organization,
+            "date": _utc_now_iso(),
+            "content_type": "hr_reimbursement_policy",
+            "file_hash": file_hash,
+            "embedding_model": settings.EMBEDDING_MODEL,
+        }
+
     async def search_policy_context(
         self,
         query_text: str,
@@ -692,42 +1669,24 @@ class VectorStoreService:
             List of relevant policy document excerpts
         """
         try:
-            if not self.client or not self.embedding_model:
+            if not self.client:
                 raise ValueError("Vector store not properly initialized")
 
-            query_embedding = await asyncio.get_event_loop().run_in_executor(
-                None, self._generate_embedding, query_text
-            )
-
-            policy_filter = Filter(
-                must=[
-                    FieldCondition(
-                        key="doc_type",
-                        match=MatchValue(value="policy"),
-                    )
-                ]
-            )
+            query_embedding = await self._embed(query_text)
 
-            search_results = self.client.search(
+            search_results = await self.client.query_points(
                 collection_name=self.collection_name,
-                query_vector=query_embedding,
-                query_filter=policy_filter,
+                query=query_embedding,
+                query_filter=_POLICY_FILTER,
                 limit=limit,
                 score_threshold=score_threshold,
+                search_params=_SEARCH_PARAMS,
+                with_payload=True,
             )
 
-            results = []
-            for result in search_results:
-                payload = result.payload or {}
-                doc = VectorDocument(
-                    id=str(result.id),
-                    content=payload.get("content", ""),
-                    embedding=[],
-                    metadata=payload,
-                )
-                results.append(SearchResult(document=doc, score=result.score))
+            results = self._to_search_results(search_results.points)
 
-            self.logger.info(f"Retrieved {len(results)} policy documents for query")
+            self.logger.info("Retrieved %d policy documents for query", len(results))
             return results
 
         except Exception as e:
@@ -737,26 +1696,45 @@ class VectorStoreService:
     async def ensure_policy_context(self) -> bool:
         """
         Ensure policy context is available in the vector store.
-        If no policy documents exist, store a default policy.
+
+        No default policy is bundled; policies only enter the store when one
+        is uploaded, so this reports whether any policy document exists.
 
         Returns:
-            True if policy context is available
+            True if policy context is available; False if no policy is stored
+            or Qdrant cannot be reached
+
+        Raises:
+            Exception: Any failure other than Qdrant being unavailable
         """
-        try:
-            policy_results = await self.search_policy_context("reimbursement", limit=1)
+        if self._policy_available:
+            return True
 
-            if policy_results:
-                self.logger.info("Policy documents already available in vector store")
+        async with self._policy_lock:
+            if self._policy_available:
                 return True
 
-            self.logger.error("No policy documents found")
+            if not self.client:
+                self.logger.error("Error ensuring policy context: client not ready")
+                return False
 
-            raise ValueError(
-                "No policy documents found in vector store. Please upload a policy document."
-            )
+            try:
+                found = await self._has_matches(_POLICY_FILTER, exact=False)
+            except _QDRANT_UNAVAILABLE_ERRORS as e:
+                self.logger.debug(
+                    "Error ensuring policy context: %s", e, exc_info=True
+                )
+                return False
 
-        except Exception as e:
-            self.logger.error(f"Error ensuring policy context: {e}")
+            if found:
+                self.logger.info("Policy documents already available in vector store")
+                self._policy_available = True
+                return True
+
+            self.logger.error(
+                "No policy documents found in vector store. "
+                "Please upload a policy document."
+            )
             return False
 
     async def check_policy_exists(self, policy_hash: str) -> Optional[VectorDocument]:
@@ -769,4 +1747,6 @@ class VectorStoreService:
         Returns:
             VectorDocument if policy exists, None otherwise
         """
+        if not _is_sha256_hex(policy_hash):
+            return None
         return await self.check_file_exists(policy_hash, "policy")
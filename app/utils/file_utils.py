@@ -5,13 +5,15 @@ This module provides utilities for file handling, validation, and processing
 including upload validation, ZIP file extraction, and file management.
 """
 
+import asyncio
 import hashlib
 import logging
 import os
+import shutil
 import tempfile
 import zipfile
 from pathlib import Path
-from typing import List
+from typing import BinaryIO, List, Tuple
 
 import aiofiles
 from fastapi import HTTPException, UploadFile
@@ -79,10 +81,11 @@ async def save_uploaded_file(file: UploadFile, destination_dir: str) -> str:
         if hasattr(file, "file") and hasattr(file.file, "read"):
             try:
                 file.file.seek(0)
-                content = file.file.read()
-
-                async with aiofiles.open(file_path, "wb") as f:
-                    await f.write(content)
+                async with aiofiles.open(
+                    file_path, "wb", buffering=settings.IO_BUFFER_SIZE
+                ) as f:
+                    while chunk := file.file.read(settings.IO_BUFFER_SIZE):
+                        await f.write(chunk)
 
                 logger.info(f"File saved successfully (direct access): {file_path}")
                 return file_path
@@ -101,7 +104,9 @@ async def save_uploaded_file(file: UploadFile, destination_dir: str) -> str:
                     status_code=400, detail=f"File {file.filename} appears to be empty"
                 )
 
-            async with aiofiles.open(file_path, "wb") as f:
+            async with aiofiles.open(
+                file_path, "wb", buffering=settings.IO_BUFFER_SIZE
+            ) as f:
                 await f.write(content)
 
             logger.info(f"File saved successfully (async interface): {file_path}")
@@ -113,9 +118,11 @@ async def save_uploaded_file(file: UploadFile, destination_dir: str) -> str:
             # Try chunk reading
             try:
                 await file.seek(0)
-                async with aiofiles.open(file_path, "wb") as f:
+                async with aiofiles.open(
+                    file_path, "wb", buffering=settings.IO_BUFFER_SIZE
+                ) as f:
                     while True:
-                        chunk = await file.read(1024)
+                        chunk = await file.read(settings.IO_BUFFER_SIZE)
                         if not chunk:
                             break
                         await f.write(chunk)
@@ -172,6 +179,29 @@ async def extract_zip_file(zip_path: str, extract_dir: str) -> List[str]:
     Returns:
         List of paths to extracted PDF files
 
+    Raises:
+        HTTPException: If extraction fails
+    """
+    extracted = await extract_zip_file_with_hashes(zip_path, extract_dir)
+    return [pdf_path for pdf_path, _ in extracted]
+
+
+async def extract_zip_file_with_hashes(
+    zip_path: str, extract_dir: str
+) -> List[Tuple[str, str]]:
+    """
+    Extract PDF files from a ZIP file, hashing each one as it is written.
+
+    Hashing during extraction saves reading every extracted file back from
+    disk just to compute its SHA-256 for duplicate detection.
+
+    Args:
+        zip_path: Path to the ZIP file
+        extract_dir: Directory to extract files to
+
+    Returns:
+        List of (path, SHA-256 hash) pairs for the extracted PDF files
+
     Raises:
         HTTPException: If extraction fails
     """
@@ -193,21 +223,64 @@ async def extract_zip_file(zip_path: str, extract_dir: str) -> List[str]:
                 )
 
             for pdf_name in pdf_file_names:
+                extract_path = None
                 try:
+                    if (
+                        zip_ref.getinfo(pdf_name).file_size
+                        > settings.max_file_size_bytes
+                    ):
+                        logger.warning(
+                            f"Skipping {pdf_name}: exceeds maximum file size of "
+                            f"{settings.MAX_FILE_SIZE}MB"
+                        )
+                        continue
+
                     safe_name = sanitize_filename(os.path.basename(pdf_name))
                     extract_path = os.path.join(extract_dir, safe_name)
+                    # Entries in different folders can share a basename; each
+                    # gets its own file so a later entry cannot overwrite one
+                    # whose hash has already been recorded.
+                    stem, ext = os.path.splitext(safe_name)
+                    suffix = 1
+                    while os.path.exists(extract_path):
+                        suffix += 1
+                        extract_path = os.path.join(
+                            extract_dir, f"{stem}_{suffix}{ext}"
+                        )
 
                     with (
                         zip_ref.open(pdf_name) as source,
-                        open(extract_path, "wb") as target,
+                        open(
+                            extract_path, "wb", buffering=settings.IO_BUFFER_SIZE
+                        ) as target,
                     ):
-                        target.write(source.read())
-
-                    pdf_files.append(extract_path)
+                        digest = hashlib.sha256()
+                        # The declared size above comes from the uploader, so
+                        # the bytes actually decompressed are counted as well.
+                        written = 0
+                        while chunk := source.read(settings.IO_BUFFER_SIZE):
+                            written += len(chunk)
+                            if written > settings.max_file_size_bytes:
+                                break
+                            digest.update(chunk)
+                            target.write(chunk)
+
+                    if written > settings.max_file_size_bytes:
+                        os.remove(extract_path)
+                        logger.warning(
+                            f"Skipping {pdf_name}: decompresses to more than the "
+                            f"maximum file size of {settings.MAX_FILE_SIZE}MB"
+                        )
+                        continue
+
+                    pdf_files.append((extract_path, digest.hexdigest()))
                     logger.debug(f"Extracted PDF: {pdf_name} -> {extract_path}")
 
                 except Exception as e:
                     logger.warning(f"Error extracting {pdf_name}: {e}")
+                    # Do not leave a partial file behind for the next entry.
+                    if extract_path and os.path.exists(extract_path):
+                        os.remove(extract_path)
                     continue
 
         if not pdf_files:
@@ -289,8 +362,6 @@ def cleanup_temp_directory(temp_dir: str) -> bool:
         True if cleanup was successful, False otherwise
     """
     try:
-        import shutil
-
         if os.path.exists(temp_dir):
             shutil.rmtree(temp_dir)
             logger.debug(f"Cleaned up temporary directory: {temp_dir}")
@@ -386,9 +457,21 @@ async def generate_file_hash_from_path(file_path: str) -> str:
     Returns:
         SHA-256 hash string
     """
-    async with aiofiles.open(file_path, "rb") as f:
-        content = await f.read()
-        return await generate_file_hash(content)
+    return await asyncio.to_thread(_hash_file_sync, file_path)
+
+
+def _hash_file_sync(file_path: str) -> str:
+    """
+    Hash a file with hashlib.file_digest, which releases the GIL while hashing.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        SHA-256 hash string
+    """
+    with open(file_path, "rb", buffering=settings.IO_BUFFER_SIZE) as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
 
 
 async def generate_upload_file_hash(upload_file: UploadFile) -> str:
@@ -401,6 +484,21 @@ async def generate_upload_file_hash(upload_file: UploadFile) -> str:
     Returns:
         SHA-256 hash string
     """
-    content = await upload_file.read()
-    await upload_file.seek(0)
-    return await generate_file_hash(content)
+    return await asyncio.to_thread(_hash_stream_sync, upload_file.file)
+
+
+def _hash_stream_sync(stream: BinaryIO) -> str:
+    """
+    Hash a binary stream from the start, leaving it rewound for the next reader.
+
+    Args:
+        stream: Seekable binary stream, such as an upload's spooled file
+
+    Returns:
+        SHA-256 hash string
+    """
+    stream.seek(0)
+    try:
+        return hashlib.file_digest(stream, "sha256").hexdigest()
+    finally:
+        stream.seek(0)
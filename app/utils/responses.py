@@ -10,6 +10,7 @@ from typing import Any, Dict, List, Optional
 
 from fastapi import Request
 from fastapi.responses import JSONResponse
+from pydantic import BaseModel
 
 from app.models.schemas import ErrorDetail, ErrorResponse
 
@@ -19,6 +20,22 @@ def generate_request_id() -> str:
     return f"req_{uuid.uuid4().hex[:12]}"
 
 
+def format_sse_event(chunk: BaseModel) -> bytes:
+    """
+    Encode a model as a Server-Sent Events ``data:`` frame.
+
+    The frame is encoded to UTF-8 once here, so StreamingResponse forwards
+    the bytes without re-encoding every chunk.
+
+    Args:
+        chunk: Pydantic model to send as the event payload
+
+    Returns:
+        Encoded SSE frame
+    """
+    return f"data: {chunk.model_dump_json()}\n\n".encode("utf-8")
+
+
 def create_error_response(
     status_code: int,
     error_type: str,
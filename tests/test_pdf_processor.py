@@ -0,0 +1,65 @@
+"""
+Tests for PDF text extraction from encrypted documents.
+"""
+
+import asyncio
+
+import pymupdf
+import pytest
+
+from app.services.pdf_processor import _PARALLEL_MIN_PAGES, PDFProcessor
+
+
+def _write_pdf(path, page_count: int, user_pw: str = "") -> str:
+    """
+    Write an AES-256 encrypted PDF with one line of text per page.
+
+    Args:
+        path: Destination path
+        page_count: Number of pages to write
+        user_pw: Password needed to open the document; empty opens without one
+
+    Returns:
+        Path of the written file as a string
+    """
+    doc = pymupdf.open()
+    for page_num in range(page_count):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Invoice page {page_num + 1} total 42.00")
+    doc.save(
+        str(path),
+        encryption=pymupdf.PDF_ENCRYPT_AES_256,
+        owner_pw="owner-secret",
+        user_pw=user_pw,
+    )
+    doc.close()
+    return str(path)
+
+
+def test_extracts_text_from_encrypted_pdf(tmp_path):
+    """An owner-password-only PDF is decrypted once and every page is read."""
+    pdf_path = _write_pdf(tmp_path / "encrypted.pdf", page_count=3)
+
+    text = asyncio.run(PDFProcessor().extract_text(pdf_path))
+
+    for page_num in (1, 2, 3):
+        assert f"Invoice page {page_num} total 42.00" in text
+
+
+def test_extracts_text_from_encrypted_pdf_in_worker_processes(tmp_path):
+    """Pool workers open and decrypt the document themselves."""
+    page_count = _PARALLEL_MIN_PAGES + 2
+    pdf_path = _write_pdf(tmp_path / "encrypted_long.pdf", page_count=page_count)
+
+    text = asyncio.run(PDFProcessor().extract_text(pdf_path))
+
+    for page_num in range(1, page_count + 1):
+        assert f"Invoice page {page_num} total 42.00" in text
+
+
+def test_rejects_pdf_with_user_password(tmp_path):
+    """A PDF that needs a real password fails instead of returning no text."""
+    pdf_path = _write_pdf(tmp_path / "locked.pdf", page_count=1, user_pw="user-secret")
+
+    with pytest.raises(ValueError, match="encrypted"):
+        asyncio.run(PDFProcessor().extract_text(pdf_path))